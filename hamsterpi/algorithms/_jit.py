@@ -0,0 +1,35 @@
+"""Optional Numba acceleration for small per-frame kernels.
+
+Numba is not listed in requirements.txt because wheels are not available for
+every Raspberry Pi image. When it is missing, :func:`njit` returns the function
+unchanged and callers check :data:`NUMBA_AVAILABLE` to pick a NumPy/OpenCV path.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    from numba import njit as _numba_njit
+    from numba import prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    _numba_njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args: Any, **kwargs: Any) -> Callable:
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func: Callable) -> Callable:
+        return func
+
+    return decorator
+
+
+__all__ = ["NUMBA_AVAILABLE", "njit", "prange"]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import base64
 import json
 from collections import defaultdict, deque
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
@@ -11,11 +11,112 @@ import cv2
 import numpy as np
 import requests
 
-Point = Tuple[int, int]
-NIGHT_HOURS = {19, 20, 21, 22, 23, 0, 1, 2, 3, 4, 5, 6}
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to requests' stdlib json encoding
+    orjson = None
 
+from ._jit import NUMBA_AVAILABLE, njit
 
-@dataclass
+Point = Tuple[int, int]
+NIGHT_HOURS = {19, 20, 21, 22, 23, 0, 1, 2, 3, 4, 5, 6}
+RECENT_PATH_CAPACITY = 200
+STEREOTYPY_EVENT_CAPACITY = 180
+# Day keys are integer days since this epoch rather than ``date`` objects.
+_EPOCH_ORDINAL = date(2000, 3, 1).toordinal()
+
+VLM_BEHAVIOR_PROMPT = (
+    "Analyze hamster behavior from this frame and output strict JSON only. "
+    "JSON keys: awake_probability, grooming_probability, digging_probability, "
+    "stereotypy_probability, behavior_tags, notes. "
+    "All probabilities are 0..1. behavior_tags is an array of short strings."
+)
+
+
+def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
+    # Written as comparisons rather than max(min()) to avoid two builtin calls per clamp.
+    # The upper bound is tested first so NaN maps to ``high``, as max(low, min(high, nan)) did.
+    value = float(value)
+    if value <= high:
+        return value if value >= low else low
+    return high
+
+
+def _json_loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (NaN, >64-bit ints); let the stdlib decide.
+            pass
+    return json.loads(data)
+
+
+def _day_index(ts: datetime) -> int:
+    return ts.toordinal() - _EPOCH_ORDINAL
+
+
+def _day_from_index(day: int) -> date:
+    return date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+@njit(cache=True)
+def _path_variance(buf: np.ndarray, count: int) -> float:
+    # Single-pass Welford over the filled part of the ring; order does not matter for variance.
+    mean_x = 0.0
+    mean_y = 0.0
+    m2_x = 0.0
+    m2_y = 0.0
+    for i in range(count):
+        n = i + 1
+        x = float(buf[i, 0])
+        y = float(buf[i, 1])
+        dx = x - mean_x
+        dy = y - mean_y
+        mean_x += dx / n
+        mean_y += dy / n
+        m2_x += dx * (x - mean_x)
+        m2_y += dy * (y - mean_y)
+    if count == 0:
+        return 0.0
+    return 0.5 * (m2_x + m2_y) / count
+
+
+@njit(cache=True)
+def _pnpoly(
+    px: float,
+    py: float,
+    hx: np.ndarray,
+    hy: np.ndarray,
+    xmin: float,
+    ymin: float,
+    xmax: float,
+    ymax: float,
+) -> bool:
+    if px < xmin or px > xmax or py < ymin or py > ymax:
+        return False
+    inside = False
+    n = hx.shape[0]
+    j = n - 1
+    for i in range(n):
+        # cv2.pointPolygonTest(...) >= 0 counts points on an edge as inside, so match that first.
+        ex = hx[j] - hx[i]
+        ey = hy[j] - hy[i]
+        if (
+            ex * (py - hy[i]) == ey * (px - hx[i])
+            and min(hx[i], hx[j]) <= px <= max(hx[i], hx[j])
+            and min(hy[i], hy[j]) <= py <= max(hy[i], hy[j])
+        ):
+            return True
+        if (hy[i] > py) != (hy[j] > py):
+            x_cross = (hx[j] - hx[i]) * (py - hy[i]) / (hy[j] - hy[i]) + hx[i]
+            if px < x_cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+@dataclass(slots=True)
 class BehaviorMetrics:
     timestamp: str
     awake: bool
@@ -31,7 +132,21 @@ class BehaviorMetrics:
     vlm_notes: str
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Explicit literal: asdict() walks fields reflectively and deep-copies.
+        return {
+            "timestamp": self.timestamp,
+            "awake": self.awake,
+            "grooming_detected": self.grooming_detected,
+            "digging_detected": self.digging_detected,
+            "stereotypy_detected": self.stereotypy_detected,
+            "anxiety_index": self.anxiety_index,
+            "grooming_count": self.grooming_count,
+            "digging_seconds": self.digging_seconds,
+            "awake_confidence": self.awake_confidence,
+            "vlm_used": self.vlm_used,
+            "behavior_tags": list(self.behavior_tags),
+            "vlm_notes": self.vlm_notes,
+        }
 
 
 @dataclass
@@ -53,63 +168,104 @@ class BehavioralLogger:
         vlm_config: Any | None = None,
         vlm_sample_interval_seconds: int = 120,
     ) -> None:
-        self.hideout_polygon = np.array(hideout_polygon, dtype=np.int32)
+        self.hideout_polygon = np.array(hideout_polygon, dtype=np.int32).reshape(-1, 2)
+        self._hx = self.hideout_polygon[:, 0].astype(np.float32)
+        self._hy = self.hideout_polygon[:, 1].astype(np.float32)
+        if self.hideout_polygon.shape[0] >= 3:
+            self._hideout_bbox = (
+                float(self._hx.min()),
+                float(self._hy.min()),
+                float(self._hx.max()),
+                float(self._hy.max()),
+            )
+        else:
+            self._hideout_bbox = None
         self.vlm_config = vlm_config
         self.vlm_sample_interval_seconds = max(15, int(vlm_sample_interval_seconds))
 
-        self._first_out_of_nest: Dict[date, datetime] = {}
-        self._last_back_to_nest: Dict[date, datetime] = {}
-        self._observed_seconds_by_day = defaultdict(float)
-        self._awake_seconds_by_day = defaultdict(float)
-        self._observed_seconds_by_hour = defaultdict(float)
-        self._awake_seconds_by_hour = defaultdict(float)
+        self._first_out_of_nest: Dict[int, datetime] = {}
+        self._last_back_to_nest: Dict[int, datetime] = {}
+        self._observed_seconds_by_day: Dict[int, float] = defaultdict(float)
+        self._awake_seconds_by_day: Dict[int, float] = defaultdict(float)
+        self._observed_seconds_by_hour = np.zeros(24, dtype=np.float64)
+        self._awake_seconds_by_hour = np.zeros(24, dtype=np.float64)
+        self._night_mask = np.zeros(24, dtype=np.float64)
+        self._night_mask[sorted(NIGHT_HOURS)] = 1.0
         self._awake_switch_events: Deque[float] = deque(maxlen=720)
         self._last_awake_state: Optional[bool] = None
 
         self._grooming_count = 0
         self._digging_seconds = 0.0
 
-        self._recent_stereotypy_events: Deque[float] = deque(maxlen=180)
-        self._last_grooming_ts: Optional[datetime] = None
-        self._recent_path: Deque[Point] = deque(maxlen=200)
-        self._last_vlm_sample_ts: Optional[datetime] = None
+        self._stereotypy_events = np.empty(STEREOTYPY_EVENT_CAPACITY, dtype=np.float64)
+        self._stereotypy_head = 0
+        self._stereotypy_count = 0
+        self._last_grooming_ts: Optional[float] = None
+        self._recent_path = np.empty((RECENT_PATH_CAPACITY, 2), dtype=np.float32)
+        self._recent_path_head = 0
+        self._recent_path_count = 0
+        self._last_repetitive_path = False
+        self._last_vlm_sample_ts: Optional[float] = None
         self._last_vlm_snapshot: Optional[VLMBehaviorSnapshot] = None
         self._vlm_samples = 0
+        self._http = requests.Session()
+        self._headers_api_key: Optional[str] = None
+        self._headers: Dict[str, str] = {}
+        self._webp_supported: Optional[bool] = None
 
-    @staticmethod
-    def _in_polygon(point: Point, polygon: np.ndarray) -> bool:
-        return cv2.pointPolygonTest(polygon, point, False) >= 0
-
-    @staticmethod
-    def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
-        return max(low, min(high, float(value)))
+    def _in_hideout(self, point: Point) -> bool:
+        if self._hideout_bbox is None:
+            return False
+        xmin, ymin, xmax, ymax = self._hideout_bbox
+        px = float(point[0])
+        py = float(point[1])
+        if px < xmin or px > xmax or py < ymin or py > ymax:
+            return False
+        if NUMBA_AVAILABLE:
+            return bool(_pnpoly(px, py, self._hx, self._hy, xmin, ymin, xmax, ymax))
+        return cv2.pointPolygonTest(self.hideout_polygon, (px, py), False) >= 0
 
-    @staticmethod
-    def _encode_image_b64(image: np.ndarray) -> str:
+    def _encode_image_b64(self, image: np.ndarray) -> Tuple[str, str]:
         resized = image
         height, width = image.shape[:2]
         if width > 640:
             target_width = 640
             target_height = max(1, int(round(height * target_width / max(width, 1))))
-            resized = cv2.resize(image, (target_width, target_height), interpolation=cv2.INTER_AREA)
-        ok, encoded = cv2.imencode(".jpg", resized, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            resized = cv2.resize(image, (target_width, target_height), interpolation=cv2.INTER_LINEAR)
+
+        if self._webp_supported is not False:
+            try:
+                ok, encoded = cv2.imencode(".webp", resized, [cv2.IMWRITE_WEBP_QUALITY, 75])
+            except cv2.error:
+                ok = False
+            self._webp_supported = bool(ok)
+            if ok:
+                return "image/webp", base64.b64encode(memoryview(encoded)).decode("ascii")
+
+        ok, encoded = cv2.imencode(
+            ".jpg",
+            resized,
+            [cv2.IMWRITE_JPEG_QUALITY, 70, cv2.IMWRITE_JPEG_PROGRESSIVE, 0, cv2.IMWRITE_JPEG_OPTIMIZE, 0],
+        )
         if not ok:
             raise ValueError("Failed to encode image")
-        return base64.b64encode(encoded.tobytes()).decode("ascii")
+        return "image/jpeg", base64.b64encode(memoryview(encoded)).decode("ascii")
 
     @staticmethod
     def _extract_json(raw_text: str) -> Dict[str, Any]:
         text = str(raw_text or "").strip()
         if not text:
             raise ValueError("VLM returned empty text")
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            start = text.find("{")
-            end = text.rfind("}")
-            if start >= 0 and end > start:
-                return json.loads(text[start : end + 1])
-            raise
+        if text[0] == "{" and text[-1] == "}":
+            try:
+                return _json_loads(text)
+            except json.JSONDecodeError:
+                pass
+        start = text.find("{")
+        end = text.rfind("}")
+        if start >= 0 and end > start:
+            return _json_loads(text[start : end + 1])
+        return _json_loads(text)
 
     @staticmethod
     def _extract_content(response_json: Dict[str, Any]) -> str:
@@ -124,6 +280,12 @@ class BehavioralLogger:
             return "".join(parts)
         return ""
 
+    def _auth_headers(self, api_key: str) -> Dict[str, str]:
+        if api_key != self._headers_api_key:
+            self._headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+            self._headers_api_key = api_key
+        return self._headers
+
     def _query_vlm(self, image: np.ndarray, context: str) -> Optional[VLMBehaviorSnapshot]:
         if not self.vlm_config or not getattr(self.vlm_config, "enabled", False):
             return None
@@ -132,15 +294,8 @@ class BehavioralLogger:
         if not api_key:
             return None
 
-        image_b64 = self._encode_image_b64(image)
-        prompt = (
-            "Analyze hamster behavior from this frame and output strict JSON only. "
-            "JSON keys: awake_probability, grooming_probability, digging_probability, "
-            "stereotypy_probability, behavior_tags, notes. "
-            "All probabilities are 0..1. behavior_tags is an array of short strings."
-        )
-        if context:
-            prompt += f" Context: {context}"
+        image_mime, image_b64 = self._encode_image_b64(image)
+        prompt = f"{VLM_BEHAVIOR_PROMPT} Context: {context}" if context else VLM_BEHAVIOR_PROMPT
 
         payload = {
             "model": self.vlm_config.model,
@@ -151,23 +306,31 @@ class BehavioralLogger:
                         {"type": "text", "text": prompt},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"},
+                            "image_url": {"url": f"data:{image_mime};base64,{image_b64}"},
                         },
                     ],
                 }
             ],
             "temperature": 0.1,
         }
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        response = requests.post(
-            self.vlm_config.endpoint,
-            headers=headers,
-            json=payload,
-            timeout=self.vlm_config.timeout_seconds,
-        )
+        headers = self._auth_headers(api_key)
+        if orjson is not None:
+            response = self._http.post(
+                self.vlm_config.endpoint,
+                headers=headers,
+                data=orjson.dumps(payload),
+                timeout=self.vlm_config.timeout_seconds,
+            )
+        else:
+            response = self._http.post(
+                self.vlm_config.endpoint,
+                headers=headers,
+                json=payload,
+                timeout=self.vlm_config.timeout_seconds,
+            )
         response.raise_for_status()
 
-        parsed = self._extract_json(self._extract_content(response.json()))
+        parsed = self._extract_json(self._extract_content(_json_loads(response.content)))
         tags_raw = parsed.get("behavior_tags", [])
         if isinstance(tags_raw, str):
             tags_raw = [item.strip() for item in tags_raw.split(",") if item.strip()]
@@ -178,10 +341,10 @@ class BehavioralLogger:
         ][:8]
 
         return VLMBehaviorSnapshot(
-            awake_probability=self._clamp(float(parsed.get("awake_probability", 0.5))),
-            grooming_probability=self._clamp(float(parsed.get("grooming_probability", 0.0))),
-            digging_probability=self._clamp(float(parsed.get("digging_probability", 0.0))),
-            stereotypy_probability=self._clamp(float(parsed.get("stereotypy_probability", 0.0))),
+            awake_probability=_clamp(float(parsed.get("awake_probability", 0.5))),
+            grooming_probability=_clamp(float(parsed.get("grooming_probability", 0.0))),
+            digging_probability=_clamp(float(parsed.get("digging_probability", 0.0))),
+            stereotypy_probability=_clamp(float(parsed.get("stereotypy_probability", 0.0))),
             behavior_tags=tags,
             notes=str(parsed.get("notes", "vlm-behavior")),
         )
@@ -190,6 +353,7 @@ class BehavioralLogger:
         self,
         image: Optional[np.ndarray],
         timestamp: datetime,
+        ts_epoch: float,
         zone: Optional[str],
         action_probs: Dict[str, float],
     ) -> Optional[VLMBehaviorSnapshot]:
@@ -199,9 +363,10 @@ class BehavioralLogger:
         if image is None:
             return self._last_vlm_snapshot
 
-        should_sample = self._last_vlm_sample_ts is None or (
-            timestamp - self._last_vlm_sample_ts
-        ).total_seconds() >= self.vlm_sample_interval_seconds
+        should_sample = (
+            self._last_vlm_sample_ts is None
+            or ts_epoch - self._last_vlm_sample_ts >= self.vlm_sample_interval_seconds
+        )
         if not should_sample:
             return self._last_vlm_snapshot
 
@@ -221,16 +386,19 @@ class BehavioralLogger:
             snapshot = None
 
         if snapshot:
-            self._last_vlm_sample_ts = timestamp
+            self._last_vlm_sample_ts = ts_epoch
             self._last_vlm_snapshot = snapshot
             self._vlm_samples += 1
 
         return self._last_vlm_snapshot
 
+    def close(self) -> None:
+        self._http.close()
+
     def _track_schedule(self, ts: datetime, awake: Optional[bool]) -> bool:
-        day = ts.date()
         if awake is None:
             return False
+        day = _day_index(ts)
 
         if awake and day not in self._first_out_of_nest:
             self._first_out_of_nest[day] = ts
@@ -241,38 +409,73 @@ class BehavioralLogger:
 
     def _detect_stereotypy(
         self,
-        ts: datetime,
-        action_probs: Dict[str, float],
+        ts_epoch: float,
+        cage_biting_prob: float,
+        climb_top_prob: float,
         vlm_stereotypy_prob: Optional[float],
     ) -> bool:
-        explicit = max(action_probs.get("cage_biting", 0.0), action_probs.get("climb_top", 0.0)) > 0.6
+        explicit = cage_biting_prob > 0.6 or climb_top_prob > 0.6
 
         repetitive_path = False
-        if len(self._recent_path) >= 40:
-            pts = np.array(self._recent_path, dtype=np.float32)
-            variance = float(np.var(pts, axis=0).mean())
+        count = self._recent_path_count
+        if count >= 40:
+            if NUMBA_AVAILABLE:
+                variance = float(_path_variance(self._recent_path, count))
+            else:
+                # Mean of per-axis variances in closed form; float64 accumulators avoid
+                # cancellation between the squared sum and the squared mean.
+                pts = self._recent_path[:count]
+                sums = pts.sum(axis=0, dtype=np.float64)
+                sum_sq = float(np.einsum("ij,ij->", pts, pts, dtype=np.float64))
+                variance = (sum_sq - float(sums @ sums) / count) / (2.0 * count)
             repetitive_path = variance < 1800.0
+        self._last_repetitive_path = repetitive_path
 
         vlm_triggered = vlm_stereotypy_prob is not None and float(vlm_stereotypy_prob) > 0.68
         detected = explicit or repetitive_path or vlm_triggered
-        ts_epoch = ts.timestamp()
+        self._record_stereotypy(ts_epoch, detected)
+        return detected
+
+    def _record_stereotypy(self, ts_epoch: float, detected: bool) -> None:
         if detected:
-            self._recent_stereotypy_events.append(ts_epoch)
+            self._push_stereotypy_event(ts_epoch)
 
+        # Events are appended in time order, so stale ones are always at the head.
         cutoff = ts_epoch - 3600.0
-        while self._recent_stereotypy_events and self._recent_stereotypy_events[0] < cutoff:
-            self._recent_stereotypy_events.popleft()
-
-        return detected
+        events = self._stereotypy_events
+        head = self._stereotypy_head
+        count = self._stereotypy_count
+        while count and events[head] < cutoff:
+            head = (head + 1) % STEREOTYPY_EVENT_CAPACITY
+            count -= 1
+        self._stereotypy_head = head
+        self._stereotypy_count = count
+
+    def _push_recent_path(self, point: Point) -> None:
+        head = self._recent_path_head
+        self._recent_path[head, 0] = point[0]
+        self._recent_path[head, 1] = point[1]
+        self._recent_path_head = (head + 1) % RECENT_PATH_CAPACITY
+        if self._recent_path_count < RECENT_PATH_CAPACITY:
+            self._recent_path_count += 1
 
     def _anxiety_index(self) -> float:
         # 12 events/hour is considered severe.
-        return max(0.0, min(1.0, len(self._recent_stereotypy_events) / 12.0))
+        return _clamp(self._stereotypy_count / 12.0)
+
+    def _push_stereotypy_event(self, ts_epoch: float) -> None:
+        count = self._stereotypy_count
+        self._stereotypy_events[(self._stereotypy_head + count) % STEREOTYPY_EVENT_CAPACITY] = ts_epoch
+        if count < STEREOTYPY_EVENT_CAPACITY:
+            self._stereotypy_count = count + 1
+        else:
+            # Full: the write above replaced the oldest event.
+            self._stereotypy_head = (self._stereotypy_head + 1) % STEREOTYPY_EVENT_CAPACITY
 
     def _heuristic_awake_probability(self, centroid: Optional[Point]) -> Optional[float]:
         if centroid is None:
             return None
-        in_hideout = self._in_polygon(centroid, self.hideout_polygon)
+        in_hideout = self._in_hideout(centroid)
         return 0.08 if in_hideout else 0.92
 
     def _fuse_probability(
@@ -284,27 +487,33 @@ class BehavioralLogger:
         if base_prob is None and vlm_prob is None:
             return None
         if base_prob is None:
-            return self._clamp(float(vlm_prob))
+            return _clamp(float(vlm_prob))
         if vlm_prob is None:
-            return self._clamp(float(base_prob))
-        return self._clamp(float(base_prob) * base_weight + float(vlm_prob) * (1.0 - base_weight))
+            return _clamp(float(base_prob))
+        return _clamp(float(base_prob) * base_weight + float(vlm_prob) * (1.0 - base_weight))
 
-    def _vlm_freshness_weight(self, timestamp: datetime, active_seconds: float) -> float:
+    def _vlm_freshness_weight(self, ts_epoch: float, active_seconds: float) -> float:
         if self._last_vlm_sample_ts is None:
             return 0.0
-        age_seconds = max(0.0, (timestamp - self._last_vlm_sample_ts).total_seconds())
+        age_seconds = max(0.0, ts_epoch - self._last_vlm_sample_ts)
         if age_seconds >= active_seconds:
             return 0.0
-        return self._clamp(1.0 - age_seconds / max(active_seconds, 1e-6))
+        return _clamp(1.0 - age_seconds / max(active_seconds, 1e-6))
 
-    def _update_routine_stats(self, timestamp: datetime, dt_seconds: float, awake: Optional[bool]) -> None:
+    def _update_routine_stats(
+        self,
+        timestamp: datetime,
+        ts_epoch: float,
+        dt_seconds: float,
+        awake: Optional[bool],
+    ) -> None:
         if awake is None:
             return
         dt = max(0.0, float(dt_seconds))
         if dt <= 0.0:
             return
 
-        day = timestamp.date()
+        day = _day_index(timestamp)
         hour = timestamp.hour
         self._observed_seconds_by_day[day] += dt
         self._observed_seconds_by_hour[hour] += dt
@@ -313,15 +522,15 @@ class BehavioralLogger:
             self._awake_seconds_by_hour[hour] += dt
 
         if self._last_awake_state is not None and awake != self._last_awake_state:
-            self._awake_switch_events.append(timestamp.timestamp())
+            self._awake_switch_events.append(ts_epoch)
         self._last_awake_state = awake
 
     def _night_activity_ratio(self) -> float:
-        total_awake = sum(float(v) for v in self._awake_seconds_by_hour.values())
+        total_awake = float(self._awake_seconds_by_hour.sum())
         if total_awake <= 1e-6:
             return 0.0
-        night_awake = sum(float(self._awake_seconds_by_hour.get(h, 0.0)) for h in NIGHT_HOURS)
-        return self._clamp(night_awake / total_awake)
+        night_awake = float(self._awake_seconds_by_hour @ self._night_mask)
+        return _clamp(night_awake / total_awake)
 
     def _sleep_fragmentation_index(self) -> float:
         if not self._awake_switch_events:
@@ -329,7 +538,7 @@ class BehavioralLogger:
         latest = float(self._awake_switch_events[-1])
         cutoff = latest - 6.0 * 3600.0
         transitions = sum(1 for item in self._awake_switch_events if item >= cutoff)
-        return self._clamp(transitions / 8.0)
+        return _clamp(transitions / 8.0)
 
     def _wake_regularity_score(self) -> float:
         if len(self._first_out_of_nest) < 2:
@@ -339,15 +548,15 @@ class BehavioralLogger:
             for _, item in sorted(self._first_out_of_nest.items(), key=lambda pair: pair[0])
         ]
         std_minutes = float(np.std(np.array(minutes, dtype=np.float32)))
-        return self._clamp(1.0 - std_minutes / 180.0)
+        return _clamp(1.0 - std_minutes / 180.0)
 
     def _routine_score(self) -> float:
         night_ratio = self._night_activity_ratio()
         # Hamsters are nocturnal; ratio near 0.75 is preferred.
-        night_alignment = self._clamp(1.0 - abs(night_ratio - 0.75) / 0.75)
+        night_alignment = _clamp(1.0 - abs(night_ratio - 0.75) / 0.75)
         regularity = self._wake_regularity_score()
         fragmentation_penalty = self._sleep_fragmentation_index()
-        return self._clamp(night_alignment * 0.4 + regularity * 0.35 + (1.0 - fragmentation_penalty) * 0.25)
+        return _clamp(night_alignment * 0.4 + regularity * 0.35 + (1.0 - fragmentation_penalty) * 0.25)
 
     def update(
         self,
@@ -359,13 +568,29 @@ class BehavioralLogger:
         zone: Optional[str] = None,
     ) -> BehaviorMetrics:
         action_probs = action_probs or {}
+        get_prob = action_probs.get
+        groom_raw = float(get_prob("grooming", 0.0))
+        dig_raw = float(get_prob("digging", 0.0))
+        cage_biting_raw = float(get_prob("cage_biting", 0.0))
+        climb_top_raw = float(get_prob("climb_top", 0.0))
+
+        ts_epoch = timestamp.timestamp()
+
+        if (
+            centroid is None
+            and image is None
+            and not action_probs
+            and self._last_vlm_snapshot is None
+        ):
+            return self._idle_update(timestamp, ts_epoch)
 
         if centroid is not None:
-            self._recent_path.append(centroid)
+            self._push_recent_path(centroid)
 
         vlm_snapshot = self._maybe_update_vlm(
             image=image,
             timestamp=timestamp,
+            ts_epoch=ts_epoch,
             zone=zone,
             action_probs=action_probs,
         )
@@ -375,31 +600,31 @@ class BehavioralLogger:
             base_prob=heuristic_awake,
             vlm_prob=(vlm_snapshot.awake_probability if vlm_snapshot else None),
             base_weight=1.0 - self._vlm_freshness_weight(
-                timestamp,
+                ts_epoch,
                 active_seconds=max(180.0, float(self.vlm_sample_interval_seconds) * 1.5),
             ) * 0.35,
         )
         awake_state = None if fused_awake_probability is None else fused_awake_probability >= 0.5
 
-        self._update_routine_stats(timestamp, dt_seconds, awake_state)
+        self._update_routine_stats(timestamp, ts_epoch, dt_seconds, awake_state)
         awake = self._track_schedule(timestamp, awake_state)
 
-        event_vlm_strength = self._vlm_freshness_weight(timestamp, active_seconds=24.0) * 0.75
+        event_vlm_strength = self._vlm_freshness_weight(ts_epoch, active_seconds=24.0) * 0.75
         event_vlm_base_weight = 1.0 - event_vlm_strength
 
         grooming_prob = self._fuse_probability(
-            base_prob=self._clamp(float(action_probs.get("grooming", 0.0))),
+            base_prob=_clamp(groom_raw),
             vlm_prob=(vlm_snapshot.grooming_probability if vlm_snapshot and event_vlm_strength > 0.0 else None),
             base_weight=event_vlm_base_weight,
         ) or 0.0
         grooming_detected = grooming_prob > 0.63
         if grooming_detected:
-            if self._last_grooming_ts is None or (timestamp - self._last_grooming_ts).total_seconds() > 8:
+            if self._last_grooming_ts is None or ts_epoch - self._last_grooming_ts > 8:
                 self._grooming_count += 1
-                self._last_grooming_ts = timestamp
+                self._last_grooming_ts = ts_epoch
 
         digging_rule_prob = max(
-            self._clamp(float(action_probs.get("digging", 0.0))),
+            _clamp(dig_raw),
             0.35 if (zone or "").strip() == "sand_bath_zone" else 0.0,
         )
         digging_prob = self._fuse_probability(
@@ -412,8 +637,9 @@ class BehavioralLogger:
             self._digging_seconds += dt_seconds
 
         stereotypy_detected = self._detect_stereotypy(
-            timestamp,
-            action_probs,
+            ts_epoch,
+            cage_biting_raw,
+            climb_top_raw,
             vlm_stereotypy_prob=(
                 vlm_snapshot.stereotypy_probability
                 if vlm_snapshot and event_vlm_strength > 0.0
@@ -436,6 +662,26 @@ class BehavioralLogger:
             vlm_notes=(vlm_snapshot.notes if vlm_snapshot else ""),
         )
 
+    def _idle_update(self, timestamp: datetime, ts_epoch: float) -> BehaviorMetrics:
+        # No centroid, frame, action scores or VLM snapshot: awake is unknown, every fused
+        # probability is 0 and the path is unchanged, so only the stereotypy window moves.
+        stereotypy_detected = self._last_repetitive_path
+        self._record_stereotypy(ts_epoch, stereotypy_detected)
+        return BehaviorMetrics(
+            timestamp=timestamp.isoformat(),
+            awake=False,
+            grooming_detected=False,
+            digging_detected=False,
+            stereotypy_detected=stereotypy_detected,
+            anxiety_index=self._anxiety_index(),
+            grooming_count=self._grooming_count,
+            digging_seconds=self._digging_seconds,
+            awake_confidence=0.0,
+            vlm_used=False,
+            behavior_tags=[],
+            vlm_notes="",
+        )
+
     def schedule_summary(self) -> Dict[str, Any]:
         observed_days = set(self._observed_seconds_by_day.keys()) | set(self._first_out_of_nest.keys()) | set(self._last_back_to_nest.keys())
         if not observed_days:
@@ -458,10 +704,10 @@ class BehavioralLogger:
         awake_seconds = float(self._awake_seconds_by_day.get(latest_day, 0.0))
         awake_ratio = awake_seconds / observed_seconds if observed_seconds > 1e-6 else 0.0
         return {
-            "day": latest_day.isoformat(),
+            "day": _day_from_index(latest_day).isoformat(),
             "first_out": first_out.isoformat() if first_out else "",
             "last_in": last_in.isoformat() if last_in else "",
-            "awake_ratio": round(self._clamp(awake_ratio), 4),
+            "awake_ratio": round(_clamp(awake_ratio), 4),
             "night_activity_ratio": round(self._night_activity_ratio(), 4),
             "sleep_fragmentation_index": round(self._sleep_fragmentation_index(), 4),
             "routine_score": round(self._routine_score(), 4),
@@ -3,11 +3,16 @@ from __future__ import annotations
 from collections import deque
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Deque, Dict, List, Sequence
+from typing import Deque, Dict, List, Optional, Sequence
 
 import cv2
 import numpy as np
 
+# Std of the L2 Sobel magnitude that counts as fully rough bedding.
+BEDDING_ROUGHNESS_SCALE = 120.0
+# Summed absolute change over the 64-cell bedding signature below which the last score is reused.
+BEDDING_SIGNATURE_TOLERANCE = 50.0
+
 
 @dataclass
 class EnvironmentMetrics:
@@ -44,6 +49,13 @@ class EnvironmentAnalyzer:
         self.clutter_edge_threshold = clutter_edge_threshold
         self.bedding_roi = bedding_roi
         self._history: Deque[EnvironmentMetrics] = deque(maxlen=max_history)
+        # Running sums over _history so summary() does not rescan it.
+        self._sum_comfort = 0.0
+        self._sum_clean = 0.0
+        self._sum_light = 0.0
+        # Bedding texture changes over minutes; reuse evenness while its 8x8 signature holds.
+        self._bedding_signature: Optional[np.ndarray] = None
+        self._bedding_evenness_cache = 0.5
 
     @staticmethod
     def _clamp(value: float, low: float, high: float) -> float:
@@ -72,24 +84,34 @@ class EnvironmentAnalyzer:
             return 0.5
 
         gray = cv2.cvtColor(bedding, cv2.COLOR_BGR2GRAY)
+        signature = cv2.resize(gray, (8, 8), interpolation=cv2.INTER_AREA)
+        if self._bedding_signature is not None:
+            change = float(cv2.sumElems(cv2.absdiff(signature, self._bedding_signature))[0])
+            if change < BEDDING_SIGNATURE_TOLERANCE:
+                return self._bedding_evenness_cache
         sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
         sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
         grad = cv2.magnitude(sobel_x, sobel_y)
-        roughness = float(np.std(grad)) / 120.0
-        return self._clamp(1.0 - roughness, 0.0, 1.0)
+        roughness = float(cv2.meanStdDev(grad)[1][0, 0]) / BEDDING_ROUGHNESS_SCALE
+        evenness = self._clamp(1.0 - roughness, 0.0, 1.0)
+        self._bedding_signature = signature
+        self._bedding_evenness_cache = evenness
+        return evenness
 
     def update(self, frame: np.ndarray, timestamp: datetime) -> EnvironmentMetrics:
         small = cv2.resize(frame, (0, 0), fx=0.35, fy=0.35, interpolation=cv2.INTER_AREA)
         gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
         blur = cv2.GaussianBlur(gray, (5, 5), 0)
 
-        brightness = float(np.mean(blur)) / 255.0
-        contrast = float(np.std(blur)) / 255.0
+        mean, std = cv2.meanStdDev(blur)
+        brightness = float(mean[0, 0]) / 255.0
+        contrast = float(std[0, 0]) / 255.0
 
-        dark_ratio = float(np.count_nonzero(blur < 42)) / float(blur.size)
+        dark_mask = cv2.compare(blur, 42, cv2.CMP_LT)
+        dark_ratio = float(cv2.countNonZero(dark_mask)) / float(blur.size)
 
         edges = cv2.Canny(blur, 60, 150)
-        edge_density = float(np.count_nonzero(edges)) / float(edges.size)
+        edge_density = float(cv2.countNonZero(edges)) / float(edges.size)
 
         bedding_evenness = self._bedding_evenness(frame)
 
@@ -133,6 +155,14 @@ class EnvironmentAnalyzer:
             comfort_index=round(comfort, 4),
             risk_level=self._risk_label(comfort),
         )
+        if len(self._history) == self._history.maxlen:
+            oldest = self._history[0]
+            self._sum_comfort -= oldest.comfort_index
+            self._sum_clean -= oldest.cleanliness_score
+            self._sum_light -= oldest.lighting_score
+        self._sum_comfort += metrics.comfort_index
+        self._sum_clean += metrics.cleanliness_score
+        self._sum_light += metrics.lighting_score
         self._history.append(metrics)
         return metrics
 
@@ -148,9 +178,10 @@ class EnvironmentAnalyzer:
                 "latest_risk_level": "unknown",
             }
 
-        comfort = float(np.mean([x.comfort_index for x in self._history]))
-        clean = float(np.mean([x.cleanliness_score for x in self._history]))
-        light = float(np.mean([x.lighting_score for x in self._history]))
+        count = len(self._history)
+        comfort = self._sum_comfort / count
+        clean = self._sum_clean / count
+        light = self._sum_light / count
         latest_risk = self._history[-1].risk_level
 
         return {
@@ -38,9 +38,26 @@ class InventoryWatcher:
         self.gnaw_roi = gnaw_roi
         self.low_water_threshold = low_water_threshold
         self.low_food_threshold = low_food_threshold
-        self._baseline_gnaw_patch: Optional[np.ndarray] = None
-        self._hoard_map = np.zeros(frame_shape, dtype=np.float32)
+        # Slow moving reference so lighting drift does not read as wear.
+        self._baseline_gnaw_f32: Optional[np.ndarray] = None
+        self._baseline_gnaw_u8: Optional[np.ndarray] = None
+        self._gnaw_baseline_alpha = 0.001
+        # Hotspots only need coarse placement, so the hoard accumulator lives on an 8x coarser grid.
+        self._frame_shape = (int(frame_shape[0]), int(frame_shape[1]))
+        self._hoard_scale = 8
+        self._hoard_map = np.zeros(
+            (
+                max(1, -(-self._frame_shape[0] // self._hoard_scale)),
+                max(1, -(-self._frame_shape[1] // self._hoard_scale)),
+            ),
+            dtype=np.float32,
+        )
+        self._hoard_tmp = np.empty_like(self._hoard_map)
+        # The map only changes when transfer points arrive, so hotspots are recomputed lazily.
+        self._hotspot_cache: Optional[List[dict]] = None
+        self._hotspot_cache_k = 0
         self._grain_open_kernel = np.ones((3, 3), np.uint8)
+        self._grain_buf: Optional[np.ndarray] = None
 
     @staticmethod
     def _crop(frame: np.ndarray, roi: Sequence[int]) -> np.ndarray:
@@ -58,8 +75,9 @@ class InventoryWatcher:
 
         gray = cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY)
         smooth = cv2.GaussianBlur(gray, (5, 5), 0)
-        vertical_profile = np.mean(smooth, axis=1)
-        grad = np.abs(np.gradient(vertical_profile))
+        vertical_profile = cv2.reduce(smooth, 1, cv2.REDUCE_AVG, dtype=cv2.CV_32F).ravel()
+        # Forward differences peak on the same row as np.gradient for a level step.
+        grad = np.abs(np.diff(vertical_profile))
         line_idx = int(np.argmax(grad))
 
         # Ratio is top-to-bottom fullness estimate.
@@ -72,12 +90,13 @@ class InventoryWatcher:
             return 0.0
 
         hsv = cv2.cvtColor(patch, cv2.COLOR_BGR2HSV)
-        sat = hsv[:, :, 1]
-        val = hsv[:, :, 2]
+        if self._grain_buf is None or self._grain_buf.shape != hsv.shape[:2]:
+            self._grain_buf = np.empty(hsv.shape[:2], dtype=np.uint8)
 
-        grain_like = ((sat > 40) & (val > 45)).astype(np.uint8) * 255
-        grain_like = cv2.morphologyEx(grain_like, cv2.MORPH_OPEN, self._grain_open_kernel, iterations=1)
-        return self._clamp(float(np.count_nonzero(grain_like)) / float(grain_like.size))
+        # sat > 40 and val > 45, any hue.
+        grain_like = cv2.inRange(hsv, (0, 41, 46), (255, 255, 255), dst=self._grain_buf)
+        cv2.morphologyEx(grain_like, cv2.MORPH_OPEN, self._grain_open_kernel, dst=grain_like, iterations=1)
+        return self._clamp(float(cv2.countNonZero(grain_like)) / float(grain_like.size))
 
     def _estimate_gnaw_wear(self, frame: np.ndarray) -> float:
         patch = self._crop(frame, self.gnaw_roi)
@@ -85,38 +104,57 @@ class InventoryWatcher:
             return 0.0
 
         gray = cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY)
-        if self._baseline_gnaw_patch is None:
-            self._baseline_gnaw_patch = gray.copy()
+        if self._baseline_gnaw_f32 is None or self._baseline_gnaw_f32.shape != gray.shape:
+            self._baseline_gnaw_f32 = gray.astype(np.float32)
+            self._baseline_gnaw_u8 = gray.copy()
             return 0.0
 
-        diff = cv2.absdiff(self._baseline_gnaw_patch, gray)
-        wear = float(np.mean(diff)) / 255.0
+        cv2.accumulateWeighted(gray, self._baseline_gnaw_f32, self._gnaw_baseline_alpha)
+        reference = cv2.convertScaleAbs(self._baseline_gnaw_f32, dst=self._baseline_gnaw_u8)
+        diff = cv2.absdiff(reference, gray)
+        wear = cv2.mean(diff)[0] / 255.0
         return self._clamp(wear)
 
     def _update_hoard_map(self, transfer_points: Optional[Iterable[Tuple[int, int]]]) -> None:
         if not transfer_points:
             return
 
-        for x, y in transfer_points:
-            if 0 <= y < self._hoard_map.shape[0] and 0 <= x < self._hoard_map.shape[1]:
-                self._hoard_map[y, x] += 1.0
+        pts = np.asarray(list(transfer_points), dtype=np.int32).reshape(-1, 2)
+        height, width = self._frame_shape
+        xs = pts[:, 0]
+        ys = pts[:, 1]
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        scale = self._hoard_scale
+        # np.add.at accumulates repeated coordinates, unlike fancy-index +=.
+        np.add.at(self._hoard_map, (ys[inside] // scale, xs[inside] // scale), 1.0)
 
-        cv2.GaussianBlur(self._hoard_map, (11, 11), 0, dst=self._hoard_map)
+        cv2.GaussianBlur(self._hoard_map, (11, 11), 0, dst=self._hoard_tmp)
+        self._hoard_map, self._hoard_tmp = self._hoard_tmp, self._hoard_map
+        self._hotspot_cache = None
 
     def _top_hoard_hotspots(self, top_k: int = 3) -> List[dict]:
+        if self._hotspot_cache is None or self._hotspot_cache_k != top_k:
+            self._hotspot_cache = self._compute_hoard_hotspots(top_k)
+            self._hotspot_cache_k = top_k
+        return [dict(item) for item in self._hotspot_cache]
+
+    def _compute_hoard_hotspots(self, top_k: int) -> List[dict]:
         if float(np.max(self._hoard_map)) <= 0.0:
             return []
 
         flat = self._hoard_map.reshape(-1)
+        top_k = min(top_k, flat.size)
         top_indices = np.argpartition(flat, -top_k)[-top_k:]
         top_indices = top_indices[np.argsort(flat[top_indices])[::-1]]
 
         hotspots = []
         max_value = float(np.max(self._hoard_map))
         width = self._hoard_map.shape[1]
+        scale = self._hoard_scale
         for idx in top_indices:
-            y = int(idx // width)
-            x = int(idx % width)
+            # Report the centre of the coarse cell in frame coordinates.
+            y = min(int(idx // width) * scale + scale // 2, self._frame_shape[0] - 1)
+            x = min(int(idx % width) * scale + scale // 2, self._frame_shape[1] - 1)
             hotspots.append(
                 {
                     "x": x,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 import cv2
 import numpy as np
@@ -22,6 +22,9 @@ class MotionAnalysisState:
 class MotionChangeAnalyzer:
     """Compute frame-difference motion signal for analysis gating."""
 
+    # Output feeds a binary threshold, so interpolation quality does not matter here.
+    _RESIZE_INTERP = cv2.INTER_NEAREST
+
     def __init__(
         self,
         downscale_width: int,
@@ -36,25 +39,24 @@ class MotionChangeAnalyzer:
 
         self._prev_gray: Optional[np.ndarray] = None
         self._open_kernel_3 = np.ones((3, 3), np.uint8)
-        self._cached_input_size: Optional[tuple[int, int]] = None
-        self._cached_target_size: Optional[tuple[int, int]] = None
+        self._diff_buf: Optional[np.ndarray] = None
+        self._mask_buf: Optional[np.ndarray] = None
+        # Target size for the last seen input size, so frames of that size skip the arithmetic.
+        self._input_hw: Optional[Tuple[int, int]] = None
+        self._target_size: Tuple[int, int] = (0, 0)
 
     def _preprocess(self, frame: np.ndarray) -> np.ndarray:
-        h, w = frame.shape[:2]
-        input_size = (w, h)
-        if input_size != self._cached_input_size:
-            target_w = min(self.downscale_width, w)
-            target_h = max(1, int(h * target_w / max(w, 1)))
-            self._cached_input_size = input_size
-            self._cached_target_size = (target_w, target_h)
-        target_size = self._cached_target_size
-        if target_size is None:
+        input_hw = frame.shape[:2]
+        if input_hw != self._input_hw:
+            h, w = input_hw
             target_w = min(self.downscale_width, w)
-            target_h = max(1, int(h * target_w / max(w, 1)))
-            target_size = (target_w, target_h)
-        resized = cv2.resize(frame, target_size, interpolation=cv2.INTER_AREA)
+            self._target_size = (target_w, max(1, int(h * target_w / max(w, 1))))
+            self._input_hw = input_hw
+        resized = cv2.resize(frame, self._target_size, interpolation=self._RESIZE_INTERP)
         gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
-        cv2.GaussianBlur(gray, (self.blur_kernel, self.blur_kernel), 0, dst=gray)
+        if self.blur_kernel > 3:
+            # Box blur is enough ahead of diff + threshold + open; at <= 3 the open already removes speckle.
+            cv2.boxFilter(gray, -1, (self.blur_kernel, self.blur_kernel), dst=gray)
         return gray
 
     def update(self, frame: np.ndarray, timestamp: datetime) -> MotionAnalysisState:
@@ -69,10 +71,14 @@ class MotionChangeAnalyzer:
                 is_motion=False,
             )
 
-        diff = cv2.absdiff(self._prev_gray, processed)
-        _, mask = cv2.threshold(diff, self.diff_threshold, 255, cv2.THRESH_BINARY)
+        if self._diff_buf is None or self._diff_buf.shape != processed.shape:
+            self._diff_buf = np.empty_like(processed)
+            self._mask_buf = np.empty_like(processed)
+        diff = cv2.absdiff(self._prev_gray, processed, dst=self._diff_buf)
+        # CMP_GT keeps the THRESH_BINARY semantics (diff > threshold -> 255).
+        mask = cv2.compare(diff, self.diff_threshold, cv2.CMP_GT, dst=self._mask_buf)
         cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._open_kernel_3, dst=mask, iterations=1)
-        motion_pixels = int(np.count_nonzero(mask))
+        motion_pixels = int(cv2.countNonZero(mask))
         motion_ratio = float(motion_pixels) / float(mask.size)
         is_motion = motion_ratio >= self.min_motion_ratio
 
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import asdict, dataclass
+import math
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
@@ -12,9 +12,9 @@ Point = Tuple[int, int]
 Polygon = Sequence[Point]
 
 
-@dataclass
+@dataclass(slots=True)
 class SpatialMetrics:
-    timestamp: str
+    timestamp: datetime
     centroid: Optional[Point]
     in_zone: Optional[str]
     cumulative_path_length_m: float
@@ -25,7 +25,18 @@ class SpatialMetrics:
     tracked_area: float
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # The timestamp stays a datetime until here; isoformat() is comparatively costly per frame.
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "centroid": self.centroid,
+            "in_zone": self.in_zone,
+            "cumulative_path_length_m": self.cumulative_path_length_m,
+            "escape_detected": self.escape_detected,
+            "active_pixels": self.active_pixels,
+            "camera_centroid": self.camera_centroid,
+            "camera_bbox": self.camera_bbox,
+            "tracked_area": self.tracked_area,
+        }
 
 
 class SpatialAnalyzer:
@@ -56,17 +67,41 @@ class SpatialAnalyzer:
         self.wheel_mask_polygon = np.array(wheel_mask_polygon, dtype=np.int32)
         self.bev_homography = np.array(bev_homography, dtype=np.float32) if bev_homography is not None else None
         self.uses_bev = self.bev_homography is not None
+        # Plain floats so projecting one centroid is scalar math rather than a perspectiveTransform call.
+        # An identity homography (already top-down camera) skips projection entirely.
+        self._bev_coeffs: Optional[Tuple[float, ...]] = None
+        if self.bev_homography is not None:
+            normalized = self.bev_homography / self.bev_homography[2, 2] if self.bev_homography[2, 2] else None
+            if normalized is None or not np.allclose(normalized, np.eye(3), atol=1e-6):
+                self._bev_coeffs = tuple(float(v) for v in self.bev_homography.reshape(-1))
         self.meters_per_pixel = meters_per_pixel
 
         self._bg = cv2.createBackgroundSubtractorMOG2(history=600, varThreshold=32, detectShadows=False)
-        self._heatmap = np.zeros((frame_height, frame_width), dtype=np.float32)
+        # Each in-fence visit stamps a disc (radius ~1.2% of the short side); the published map is the
+        # fraction of each display cell the discs cover. A byte mask holds the same raster as a float map
+        # at a quarter of the memory, and a repeat of the last stamped point leaves it untouched.
+        self._heatmap = np.zeros((frame_height, frame_width), dtype=np.uint8)
+        self._centroid_heat_radius = max(2, int(round(min(frame_width, frame_height) * 0.012)))
+        self._last_heat_point: Optional[Point] = None
+        self._heatmap_cache: Optional[List[List[float]]] = None
+        self._heatmap_cache_size: Optional[Tuple[int, int]] = None
         self._previous_centroid: Optional[Point] = None
         self._previous_camera_centroid: Optional[Point] = None
         self._path_length_pixels = 0.0
         self._zone_dwell_seconds = {zone: 0.0 for zone in zones}
         self._escape_count = 0
-        self._trajectory: Deque[dict] = deque(maxlen=max_trajectory_points)
-        self._centroid_heat_radius = max(2, int(round(min(frame_width, frame_height) * 0.012)))
+        # Trajectory ring stored column-wise; dicts are only built when trajectory() is read.
+        capacity = max(0, int(max_trajectory_points))
+        self._traj_capacity = capacity
+        self._traj_head = 0
+        self._traj_count = 0
+        # Stored as datetimes and only formatted when trajectory() is read.
+        self._traj_timestamp: List[Optional[datetime]] = [None] * capacity
+        self._traj_xy = np.zeros((capacity, 2), dtype=np.int32)
+        self._traj_zone_id = np.zeros(capacity, dtype=np.int32)
+        self._traj_escape = np.zeros(capacity, dtype=np.bool_)
+        # dx, dy, step_px, speed_px_s, heading_deg (NaN when undefined).
+        self._traj_motion = np.zeros((capacity, 5), dtype=np.float64)
         self._frames_seen = 0
         self._frames_rejected_high_motion = 0
         self._frames_with_centroid = 0
@@ -78,7 +113,16 @@ class SpatialAnalyzer:
             cv2.fillPoly(self._fence_mask, [self.fence_polygon], 255)
         else:
             self._fence_mask[:, :] = 255
-        self._fence_area_pixels = max(1, int(np.count_nonzero(self._fence_mask)))
+        self._fence_area_pixels = max(1, int(cv2.countNonZero(self._fence_mask)))
+        self._has_fence = len(self.fence_polygon) >= 3
+
+        # Zones and fence are static, so rasterize them once and look centroids up by pixel.
+        # Zones are filled in reverse so the first matching zone wins, as with the polygon scan.
+        self._zone_names: List[Optional[str]] = [None] + list(self.zones)
+        zone_dtype = np.uint8 if len(self._zone_names) <= 256 else np.uint16
+        self._zone_map = np.zeros((frame_height, frame_width), dtype=zone_dtype)
+        for zone_id in range(len(self._zone_names) - 1, 0, -1):
+            cv2.fillPoly(self._zone_map, [self.zones[self._zone_names[zone_id]]], zone_id)
         self._max_reliable_motion_ratio = 0.42
         self._min_candidate_area_pixels = max(28.0, self._fence_area_pixels * 0.00018)
         self._max_candidate_area_pixels = max(self._min_candidate_area_pixels + 1.0, self._fence_area_pixels * 0.3)
@@ -91,83 +135,109 @@ class SpatialAnalyzer:
             cv2.fillPoly(self._motion_fence_mask, [self.motion_fence_polygon], 255)
         else:
             self._motion_fence_mask[:, :] = 255
-        self._wheel_mask_polygons = [self.wheel_mask_polygon] if len(self.wheel_mask_polygon) >= 3 else []
+        # Fold the wheel exclusion into the fence mask so masking motion is a single AND.
+        if len(self.wheel_mask_polygon) >= 3:
+            cv2.fillPoly(self._motion_fence_mask, [self.wheel_mask_polygon], 0)
+
+        # Nothing outside the motion fence survives the mask, so the background model and the
+        # morphology only run on its bounding box (padded so the filters see the same border).
+        if len(self.motion_fence_polygon) >= 3:
+            bx, by, bw, bh = cv2.boundingRect(self.motion_fence_polygon)
+            pad = 4
+            x0 = max(0, bx - pad)
+            y0 = max(0, by - pad)
+            x1 = min(frame_width, bx + bw + pad)
+            y1 = min(frame_height, by + bh + pad)
+        else:
+            x0, y0, x1, y1 = 0, 0, frame_width, frame_height
+        if x1 <= x0 or y1 <= y0:
+            x0, y0, x1, y1 = 0, 0, frame_width, frame_height
+        self._motion_roi = (x0, y0, x1, y1)
+        self._motion_fence_mask_roi = self._motion_fence_mask[y0:y1, x0:x1]
+        self._motion_buf = np.zeros((frame_height, frame_width), dtype=np.uint8)
+        # MOG2 dominates the spatial cost, so model the background at half resolution when the ROI allows it.
+        self._bg_scale = 2 if min(x1 - x0, y1 - y0) >= 240 else 1
+        self._bg_small_buf: Optional[np.ndarray] = None
+        # Cheap idle pre-gate: when no pixel of a tiny ROI thumbnail changes, skip MOG2 and the
+        # mask chain, still refreshing the background model every 30 idle frames. Counting changed
+        # thumbnail pixels (not the ROI-wide mean) keeps a small moving animal from reading as idle.
+        self._idle_probe_size = (80, 60)
+        self._idle_probe_prev: Optional[np.ndarray] = None
+        self._idle_pixel_threshold = 4
+        self._idle_frames = 0
+        self._idle_skip_after = 3
+        self._idle_refresh_every = 30
+        # Reused per-frame buffers: raw MOG2 output at model size and the denoised mask at ROI size.
+        model_w = max(1, (x1 - x0) // self._bg_scale)
+        model_h = max(1, (y1 - y0) // self._bg_scale)
+        self._fg_raw_buf = np.empty((model_h, model_w), dtype=np.uint8)
+        self._fg_small_buf = np.empty((model_h, model_w), dtype=np.uint8)
+        self._fg_roi_buf = np.empty((y1 - y0, x1 - x0), dtype=np.uint8)
         self._open_kernel_3 = np.ones((3, 3), np.uint8)
         self._close_kernel_5 = np.ones((5, 5), np.uint8)
 
-    @staticmethod
-    def _find_contours(mask: np.ndarray) -> List[np.ndarray]:
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        return contours or []
+    def _zone_id_for_point(self, point: Point) -> int:
+        x, y = point
+        if not (0 <= x < self.frame_width and 0 <= y < self.frame_height):
+            return 0
+        return int(self._zone_map[y, x])
 
-    @staticmethod
-    def _contour_centroid(contour: np.ndarray) -> Optional[Point]:
-        moments = cv2.moments(contour)
-        if moments["m00"] == 0:
-            return None
-        return int(moments["m10"] / moments["m00"]), int(moments["m01"] / moments["m00"])
+    def _zone_for_point(self, point: Point) -> Optional[str]:
+        return self._zone_names[self._zone_id_for_point(point)]
 
-    @staticmethod
-    def _in_polygon(point: Point, polygon: np.ndarray) -> bool:
-        if polygon is None or len(polygon) < 3:
+    def _inside_fence(self, point: Point) -> bool:
+        x, y = point
+        if not self._has_fence or not (0 <= x < self.frame_width and 0 <= y < self.frame_height):
             return False
-        return cv2.pointPolygonTest(polygon, point, False) >= 0
-
-    def _zone_for_point(self, point: Point) -> Optional[str]:
-        for zone_name, polygon in self.zones.items():
-            if self._in_polygon(point, polygon):
-                return zone_name
-        return None
+        return bool(self._fence_mask[y, x])
 
     def _project_point_to_bev(self, point: Point) -> Optional[Point]:
-        if self.bev_homography is None:
+        if self._bev_coeffs is None:
             return point
-        src = np.array([[[float(point[0]), float(point[1])]]], dtype=np.float32)
-        projected = cv2.perspectiveTransform(src, self.bev_homography)
-        x_f, y_f = float(projected[0, 0, 0]), float(projected[0, 0, 1])
-        if not np.isfinite(x_f) or not np.isfinite(y_f):
+        h00, h01, h02, h10, h11, h12, h20, h21, h22 = self._bev_coeffs
+        px, py = float(point[0]), float(point[1])
+        w = h20 * px + h21 * py + h22
+        if abs(w) < 1e-12:
             return None
-        x = int(round(np.clip(x_f, 0, self.frame_width - 1)))
-        y = int(round(np.clip(y_f, 0, self.frame_height - 1)))
+        x_f = (h00 * px + h01 * py + h02) / w
+        y_f = (h10 * px + h11 * py + h12) / w
+        if not math.isfinite(x_f) or not math.isfinite(y_f):
+            return None
+        x = int(round(min(max(x_f, 0.0), self.frame_width - 1)))
+        y = int(round(min(max(y_f, 0.0), self.frame_height - 1)))
         return (x, y)
 
-    def _select_contour(self, motion_mask: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[Point]]:
-        contours = self._find_contours(motion_mask)
-        if not contours:
-            return None, None
-
-        candidates: List[Tuple[np.ndarray, Point, float]] = []
-        for contour in contours:
-            area = float(cv2.contourArea(contour))
-            if area < self._min_candidate_area_pixels or area > self._max_candidate_area_pixels:
-                continue
-            centroid = self._contour_centroid(contour)
-            if centroid is None:
-                continue
-            candidates.append((contour, centroid, area))
+    def _select_blob(self, motion_mask: np.ndarray) -> Tuple[Optional[Tuple[int, int, int, int]], float, Optional[Point]]:
+        # One C call yields every blob's area, bbox and centroid, instead of per-contour area/moments calls.
+        count, _, stats, centroids = cv2.connectedComponentsWithStats(motion_mask, connectivity=8)
+        if count < 2:
+            return None, 0.0, None
 
-        if not candidates:
-            return None, None
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        candidates = np.flatnonzero((areas >= self._min_candidate_area_pixels) & (areas <= self._max_candidate_area_pixels)) + 1
+        if candidates.size == 0:
+            return None, 0.0, None
 
+        candidate_areas = stats[candidates, cv2.CC_STAT_AREA].astype(np.float64)
         if self._previous_camera_centroid is None:
-            contour, centroid, _ = max(candidates, key=lambda item: item[2])
-            return contour, centroid
-
-        prev = np.array(self._previous_camera_centroid, dtype=np.float32)
-        best: Optional[Tuple[np.ndarray, Point, float]] = None
-        best_score = -1.0
-        for contour, centroid, area in candidates:
-            dist = float(np.linalg.norm(np.array(centroid, dtype=np.float32) - prev))
-            if dist > self._max_jump_pixels:
-                continue
-            continuity_score = area / (1.0 + dist)
-            if continuity_score > best_score:
-                best_score = continuity_score
-                best = (contour, centroid, area)
-
-        if best is None:
-            return None, None
-        return best[0], best[1]
+            best = int(candidates[np.argmax(candidate_areas)])
+        else:
+            prev_x, prev_y = self._previous_camera_centroid
+            dist = np.hypot(centroids[candidates, 0] - prev_x, centroids[candidates, 1] - prev_y)
+            reachable = dist <= self._max_jump_pixels
+            if not reachable.any():
+                return None, 0.0, None
+            continuity_score = np.where(reachable, candidate_areas / (1.0 + dist), -1.0)
+            best = int(candidates[np.argmax(continuity_score)])
+
+        bbox = (
+            int(stats[best, cv2.CC_STAT_LEFT]),
+            int(stats[best, cv2.CC_STAT_TOP]),
+            int(stats[best, cv2.CC_STAT_WIDTH]),
+            int(stats[best, cv2.CC_STAT_HEIGHT]),
+        )
+        centroid = (int(centroids[best, 0]), int(centroids[best, 1]))
+        return bbox, float(stats[best, cv2.CC_STAT_AREA]), centroid
 
     def _smooth_centroid(self, centroid: Point) -> Point:
         if self._previous_centroid is None:
@@ -178,21 +248,84 @@ class SpatialAnalyzer:
         y = int(round(py * (1.0 - alpha) + centroid[1] * alpha))
         return x, y
 
-    def _motion_mask(self, frame: np.ndarray) -> np.ndarray:
-        fg = self._bg.apply(frame)
-        fg = cv2.medianBlur(fg, 5)
-        _, fg = cv2.threshold(fg, 190, 255, cv2.THRESH_BINARY)
+    def _motion_mask(self, frame: np.ndarray) -> Tuple[np.ndarray, int]:
+        x0, y0, x1, y1 = self._motion_roi
+        patch = frame[y0:y1, x0:x1]
+        if self._bg_scale > 1:
+            height, width = patch.shape[:2]
+            small_size = (max(1, width // self._bg_scale), max(1, height // self._bg_scale))
+            self._bg_small_buf = cv2.resize(patch, small_size, dst=self._bg_small_buf, interpolation=cv2.INTER_AREA)
+            raw = self._bg.apply(self._bg_small_buf, self._fg_raw_buf)
+            # Denoise and binarize on the small grid; a 3x3 median there spans about the old 5x5 at full size.
+            small = cv2.medianBlur(raw, 3, dst=self._fg_small_buf)
+            cv2.threshold(small, 190, 255, cv2.THRESH_BINARY, dst=small)
+            fg = cv2.resize(small, (width, height), dst=self._fg_roi_buf, interpolation=cv2.INTER_NEAREST)
+        else:
+            raw = self._bg.apply(patch, self._fg_raw_buf)
+            fg = cv2.medianBlur(raw, 5, dst=self._fg_roi_buf)
+            cv2.threshold(fg, 190, 255, cv2.THRESH_BINARY, dst=fg)
+        # Outside the ROI the buffer is never written and stays zero.
+        motion = self._motion_buf
+        motion_roi = motion[y0:y1, x0:x1]
+        # Whole-frame changes (lights, camera gain) get rejected anyway, so skip the morphology for them.
+        cv2.bitwise_and(fg, self._motion_fence_mask_roi, dst=motion_roi)
+        active_pixels = int(cv2.countNonZero(motion_roi))
+        if active_pixels > self._max_reliable_motion_ratio * self._fence_area_pixels:
+            return motion, active_pixels
         cv2.morphologyEx(fg, cv2.MORPH_OPEN, self._open_kernel_3, dst=fg, iterations=1)
         cv2.morphologyEx(fg, cv2.MORPH_CLOSE, self._close_kernel_5, dst=fg, iterations=1)
-        cv2.bitwise_and(fg, self._motion_fence_mask, dst=fg)
-        if self._wheel_mask_polygons:
-            cv2.fillPoly(fg, self._wheel_mask_polygons, 0)
-        return fg
+        cv2.bitwise_and(fg, self._motion_fence_mask_roi, dst=motion_roi)
+        return motion, int(cv2.countNonZero(motion_roi))
+
+    def _push_trajectory(
+        self,
+        timestamp: datetime,
+        point: Point,
+        zone_id: int,
+        escape: bool,
+        motion: Tuple[float, float, float, float, float],
+    ) -> None:
+        if self._traj_capacity == 0:
+            return
+        head = self._traj_head
+        self._traj_timestamp[head] = timestamp
+        self._traj_xy[head, 0] = point[0]
+        self._traj_xy[head, 1] = point[1]
+        self._traj_zone_id[head] = zone_id
+        self._traj_escape[head] = escape
+        self._traj_motion[head] = motion
+        self._traj_head = (head + 1) % self._traj_capacity
+        if self._traj_count < self._traj_capacity:
+            self._traj_count += 1
+
+    def _scene_is_idle(self, frame: np.ndarray) -> bool:
+        x0, y0, x1, y1 = self._motion_roi
+        probe = cv2.resize(frame[y0:y1, x0:x1], self._idle_probe_size, interpolation=cv2.INTER_AREA)
+        if probe.ndim == 3:
+            probe = cv2.cvtColor(probe, cv2.COLOR_BGR2GRAY)
+        # Calm frames are compared with the thumbnail from the last change, so slow creeping still adds up.
+        reference = self._idle_probe_prev
+        if (
+            reference is None
+            or reference.shape != probe.shape
+            or (cv2.absdiff(reference, probe) > self._idle_pixel_threshold).any()
+        ):
+            self._idle_probe_prev = probe
+            self._idle_frames = 0
+            return False
+        self._idle_frames += 1
+        if self._idle_frames < self._idle_skip_after:
+            return False
+        return self._idle_frames % self._idle_refresh_every != 0
 
     def update(self, frame: np.ndarray, timestamp: datetime, dt_seconds: float) -> SpatialMetrics:
         self._frames_seen += 1
-        motion = self._motion_mask(frame)
-        active_pixels = int(np.count_nonzero(motion))
+        # A static scene has no foreground, so it yields no centroid and no active pixels.
+        if self._scene_is_idle(frame):
+            motion = None
+            active_pixels = 0
+        else:
+            motion, active_pixels = self._motion_mask(frame)
         motion_ratio = active_pixels / max(self._fence_area_pixels, 1)
 
         if motion_ratio > self._max_reliable_motion_ratio:
@@ -202,7 +335,7 @@ class SpatialAnalyzer:
                 self._previous_centroid = None
                 self._previous_camera_centroid = None
             return SpatialMetrics(
-                timestamp=timestamp.isoformat(),
+                timestamp=timestamp,
                 centroid=None,
                 in_zone=None,
                 cumulative_path_length_m=self._path_length_pixels * self.meters_per_pixel,
@@ -213,13 +346,10 @@ class SpatialAnalyzer:
                 tracked_area=0.0,
             )
 
-        selected_contour, centroid_camera = self._select_contour(motion)
-        camera_bbox: Optional[Tuple[int, int, int, int]] = None
-        tracked_area = 0.0
-        if selected_contour is not None:
-            bx, by, bw, bh = cv2.boundingRect(selected_contour)
-            camera_bbox = (int(bx), int(by), int(bw), int(bh))
-            tracked_area = float(cv2.contourArea(selected_contour))
+        if motion is None:
+            camera_bbox, tracked_area, centroid_camera = None, 0.0, None
+        else:
+            camera_bbox, tracked_area, centroid_camera = self._select_blob(motion)
         centroid_raw = self._project_point_to_bev(centroid_camera) if centroid_camera is not None else None
         centroid = self._smooth_centroid(centroid_raw) if centroid_raw is not None else None
 
@@ -237,36 +367,31 @@ class SpatialAnalyzer:
             if self._previous_centroid is not None:
                 dx = float(centroid[0] - self._previous_centroid[0])
                 dy = float(centroid[1] - self._previous_centroid[1])
-                step_pixels = float(np.linalg.norm(np.array(centroid, dtype=np.float32) - np.array(self._previous_centroid, dtype=np.float32)))
+                step_pixels = math.hypot(dx, dy)
                 if step_pixels >= self._min_step_pixels:
                     self._path_length_pixels += step_pixels
-                heading_deg = float((np.degrees(np.arctan2(-dy, dx)) + 360.0) % 360.0) if step_pixels > 0 else None
+                heading_deg = (math.degrees(math.atan2(-dy, dx)) + 360.0) % 360.0 if step_pixels > 0 else None
                 speed_px_s = step_pixels / max(dt_seconds, 1e-3)
 
-            zone_name = self._zone_for_point(centroid)
+            zone_id = self._zone_id_for_point(centroid)
+            zone_name = self._zone_names[zone_id]
             if zone_name:
                 self._zone_dwell_seconds[zone_name] += dt_seconds
 
-            escape_detected = not self._in_polygon(centroid, self.fence_polygon)
+            inside_fence = self._inside_fence(centroid)
+            escape_detected = not inside_fence
             if escape_detected:
                 self._escape_count += 1
 
-            if self._in_polygon(centroid, self.fence_polygon):
-                cv2.circle(self._heatmap, centroid, self._centroid_heat_radius, 1.0, thickness=-1)
+            if inside_fence:
+                self._stamp_heatmap(centroid)
 
-            self._trajectory.append(
-                {
-                    "timestamp": timestamp.isoformat(),
-                    "x": centroid[0],
-                    "y": centroid[1],
-                    "zone": zone_name,
-                    "escape": escape_detected,
-                    "dx": round(dx, 2),
-                    "dy": round(dy, 2),
-                    "step_px": round(step_pixels, 3),
-                    "speed_px_s": round(speed_px_s, 3),
-                    "heading_deg": round(float(heading_deg), 2) if heading_deg is not None else None,
-                }
+            self._push_trajectory(
+                timestamp,
+                centroid,
+                zone_id,
+                escape_detected,
+                (dx, dy, step_pixels, speed_px_s, heading_deg if heading_deg is not None else math.nan),
             )
 
             self._previous_centroid = centroid
@@ -278,7 +403,7 @@ class SpatialAnalyzer:
                 self._previous_camera_centroid = None
 
         return SpatialMetrics(
-            timestamp=timestamp.isoformat(),
+            timestamp=timestamp,
             centroid=centroid,
             in_zone=zone_name,
             cumulative_path_length_m=self._path_length_pixels * self.meters_per_pixel,
@@ -293,12 +418,47 @@ class SpatialAnalyzer:
         return dict(self._zone_dwell_seconds)
 
     def trajectory(self) -> List[dict]:
-        return list(self._trajectory)
+        count = self._traj_count
+        start = (self._traj_head - count) % self._traj_capacity if count else 0
+        points: List[dict] = []
+        for offset in range(count):
+            idx = (start + offset) % self._traj_capacity
+            dx, dy, step_px, speed_px_s, heading_deg = self._traj_motion[idx].tolist()
+            points.append(
+                {
+                    "timestamp": self._traj_timestamp[idx].isoformat(),
+                    "x": int(self._traj_xy[idx, 0]),
+                    "y": int(self._traj_xy[idx, 1]),
+                    "zone": self._zone_names[int(self._traj_zone_id[idx])],
+                    "escape": bool(self._traj_escape[idx]),
+                    "dx": round(dx, 2),
+                    "dy": round(dy, 2),
+                    "step_px": round(step_px, 3),
+                    "speed_px_s": round(speed_px_s, 3),
+                    "heading_deg": round(heading_deg, 2) if not math.isnan(heading_deg) else None,
+                }
+            )
+        return points
 
     def heatmap(self, width: int = 64, height: int = 36) -> List[List[float]]:
-        resized = cv2.resize(self._heatmap, (width, height), interpolation=cv2.INTER_AREA)
-        if resized.max() > 0:
-            resized = resized / resized.max()
+        # Only a newly stamped disc changes the result, so reuse the last rendering until then.
+        if self._heatmap_cache is None or self._heatmap_cache_size != (width, height):
+            self._heatmap_cache = self._render_heatmap(width, height)
+            self._heatmap_cache_size = (width, height)
+        return [list(row) for row in self._heatmap_cache]
+
+    def _stamp_heatmap(self, centroid: Point) -> None:
+        if centroid == self._last_heat_point:
+            return
+        self._last_heat_point = centroid
+        cv2.circle(self._heatmap, centroid, self._centroid_heat_radius, 1, thickness=-1)
+        self._heatmap_cache = None
+
+    def _render_heatmap(self, width: int, height: int) -> List[List[float]]:
+        resized = cv2.resize(self._heatmap.astype(np.float32), (width, height), interpolation=cv2.INTER_AREA)
+        peak = float(resized.max())
+        if peak > 0:
+            resized /= peak
         return resized.round(4).tolist()
 
     def summary(self) -> dict:
@@ -1,20 +1,113 @@
 from __future__ import annotations
 
 import math
-from collections import deque
-from dataclasses import asdict, dataclass
-from datetime import datetime
-from typing import Deque, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
+from ._jit import NUMBA_AVAILABLE, njit, prange
+
 Point = Tuple[int, int]
 
+_SOURCE_CODES = {"marker": 0, "texture": 1, "predict": 2}
+STATE_SWITCH_CAPACITY = 180
+_TEXTURE_RING_COLUMNS = 360
+_DIRECTION_NAMES = ("idle", "forward", "reverse")
+_DIRECTION_IDLE = 0
+_DIRECTION_FORWARD = 1
+_DIRECTION_REVERSE = 2
+
+
+@njit(cache=True)
+def _odometer_step(
+    angle: float,
+    previous_angle: float,
+    previous_delta: float,
+    dt: float,
+    max_delta_deg_per_s: float,
+    source_code: int,
+) -> Tuple[float, float, float]:
+    # Scalar core of VirtualOdometer.update: returns (delta_deg, revolutions_delta, rpm).
+    delta = angle - previous_angle
+    if delta > 180.0:
+        delta -= 360.0
+    elif delta < -180.0:
+        delta += 360.0
+    if abs(previous_delta) >= 0.8:
+        alt = delta + 360.0 if delta < 0.0 else delta - 360.0
+        if abs(alt - previous_delta) + 12.0 < abs(delta - previous_delta):
+            delta = alt
+
+    max_delta = max(24.0, max_delta_deg_per_s * dt)
+    if abs(delta) > max_delta:
+        if source_code == 0:
+            delta = math.copysign(max_delta, delta)
+        elif source_code == 1:
+            if abs(previous_delta) > 0.1:
+                delta = math.copysign(min(max_delta, abs(previous_delta) * 1.4), delta)
+            else:
+                delta = math.copysign(max_delta, delta)
+        else:
+            delta = 0.0
+    if abs(delta) < 0.35:
+        delta = 0.0
+    if delta * previous_delta > 0.0:
+        delta = delta * 0.72 + previous_delta * 0.28
+
+    revolutions_delta = delta / 360.0
+    rpm = abs(revolutions_delta) * (60.0 / dt)
+    return delta, revolutions_delta, rpm
+
+
+@njit(cache=True)
+def _direction_step(
+    state: int,
+    candidate: int,
+    evidence: float,
+    delta: float,
+    rpm: float,
+    low_rpm_hold: float,
+    low_rpm_idle: float,
+    flip_threshold: float,
+) -> Tuple[int, int, float]:
+    # Direction hysteresis: returns (state, flip_candidate, flip_evidence_deg).
+    if abs(delta) < 0.8 or rpm < low_rpm_hold:
+        if state != _DIRECTION_IDLE and rpm >= low_rpm_idle:
+            return state, candidate, evidence
+        return _DIRECTION_IDLE, -1, 0.0
+
+    instant = _DIRECTION_FORWARD if delta > 0 else _DIRECTION_REVERSE
+    if state == _DIRECTION_IDLE or state == instant:
+        return instant, -1, 0.0
+
+    if candidate != instant:
+        evidence = abs(delta)
+    else:
+        evidence += abs(delta)
+    if evidence >= flip_threshold:
+        return instant, -1, 0.0
+    return state, instant, evidence
+
+
+@njit(parallel=True, cache=True)
+def _fused_sv_mask(hsv: np.ndarray, wheel: np.ndarray, s_th: int, v_th: int, out: np.ndarray) -> None:
+    # One pass for (S >= s_th) & (V >= v_th) & wheel instead of two inRange plus two bitwise_and;
+    # rows are independent, so they are split across threads.
+    height, width = wheel.shape
+    for i in prange(height):
+        for j in range(width):
+            if wheel[i, j] and hsv[i, j, 1] >= s_th and hsv[i, j, 2] >= v_th:
+                out[i, j] = 255
+            else:
+                out[i, j] = 0
 
-@dataclass
+
+@dataclass(slots=True)
 class OdometerMetrics:
-    timestamp: str
+    timestamp: datetime
     angle_deg: float
     delta_angle_deg: float
     rpm: float
@@ -27,7 +120,19 @@ class OdometerMetrics:
     stop_go_frequency_per_min: float
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "angle_deg": self.angle_deg,
+            "delta_angle_deg": self.delta_angle_deg,
+            "rpm": self.rpm,
+            "speed_kmh": self.speed_kmh,
+            "total_revolutions": self.total_revolutions,
+            "total_distance_m": self.total_distance_m,
+            "direction": self.direction,
+            "running": self.running,
+            "running_streak_s": self.running_streak_s,
+            "stop_go_frequency_per_min": self.stop_go_frequency_per_min,
+        }
 
 
 class VirtualOdometer:
@@ -45,93 +150,112 @@ class VirtualOdometer:
             (np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8))
             for lower, upper in marker_hsv_ranges
         ]
+        self._marker_luts = self._build_marker_luts(self.marker_hsv_ranges)
         self._wheel_circumference_m = math.pi * (self.wheel_diameter_cm / 100.0)
-        self._total_revolutions_net = 0.0
-        self._total_revolutions_abs = 0.0
+        # Revolution totals are kept as whole turns plus a [0, 1) fraction so long sessions do not
+        # lose per-frame increments to float rounding against a large running sum.
+        self._revolutions_net_whole = 0
+        self._revolutions_net_frac = 0.0
+        self._revolutions_abs_whole = 0
+        self._revolutions_abs_frac = 0.0
         self._previous_timestamp: Optional[datetime] = None
         self._previous_angle: Optional[float] = None
         self._previous_delta_deg = 0.0
         self._previous_running = False
         self._running_streak_s = 0.0
-        self._state_switches: Deque[float] = deque(maxlen=180)
+        # Ring of running/idle switch times (epoch seconds) from the last minute.
+        self._state_switches = np.zeros(STATE_SWITCH_CAPACITY, dtype=np.float64)
+        self._state_switch_head = 0
+        self._state_switch_count = 0
+        # When the oldest recorded switch leaves the 60 s window; None while the ring is empty.
+        # Switches are rare, so frames in between only compare against this.
+        self._state_switch_expiry: Optional[datetime] = None
         self._marker_missing_streak = 0
 
         self._wheel_geometry_key: Optional[Tuple[int, ...]] = None
         self._wheel_polygon = np.zeros((0, 2), dtype=np.int32)
         self._wheel_bbox = (0, 0, 0, 0)
         self._wheel_mask_local: Optional[np.ndarray] = None
+        self._marker_mask_buf: Optional[np.ndarray] = None
+        self._marker_tmp_buf: Optional[np.ndarray] = None
+        self._adaptive_mask_buf: Optional[np.ndarray] = None
+        self._hsv_buf: Optional[np.ndarray] = None
+        self._gray_buf: Optional[np.ndarray] = None
+        self._wheel_pixel_count = 0
+        self._wheel_mask_half: Optional[np.ndarray] = None
         self._ellipse_center = (0.0, 0.0)
         self._ellipse_axes = (1.0, 1.0)
         self._ellipse_angle_rad = 0.0
-        self._texture_prev_ring: Optional[np.ndarray] = None
+        # Ellipse -> unit circle as one affine map: nx = a*x + b*y + c, ny = d*x + e*y + f.
+        self._unit_circle_affine = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+        # Only the angular profile of the texture ring matters, so frames are compared by the
+        # rFFT of its column sums rather than a 2-D phase correlation of the whole ring.
+        self._texture_prev_spectrum: Optional[np.ndarray] = None
+        # Texture ring sampling map (rows are radii, columns whole degrees), built with the geometry.
+        self._ring_map_x: Optional[np.ndarray] = None
+        self._ring_map_y: Optional[np.ndarray] = None
+        self._ring_buf: Optional[np.ndarray] = None
+        # With a marker in view the texture ring is only a fallback, so it is refreshed every few
+        # frames; a delta is only trusted against the ring from the immediately preceding frame.
+        self._frame_counter = 0
+        self._texture_ring_frame = -1
+        self._texture_refresh_every = 4
         self._texture_virtual_angle: Optional[float] = None
 
         self._marker_kernel_3 = np.ones((3, 3), np.uint8)
         self._min_marker_area_ratio = 0.00012
         self._max_marker_area_ratio = 0.20
         self._max_reliable_rpm = 260.0
-        self._direction_state = "idle"
-        self._direction_flip_candidate: Optional[str] = None
+        # Per-frame scalars derived from the constructor settings.
+        self._max_delta_deg_per_s = self._max_reliable_rpm * 6.0
+        self._speed_scale = self._wheel_circumference_m * 3.6
+        self._low_rpm_hold = max(1.6, float(min_rpm_for_running) * 0.28)
+        self._low_rpm_idle = max(1.2, float(min_rpm_for_running) * 0.2)
+        # Direction state machine is int-coded (see _DIRECTION_NAMES); -1 means no flip candidate.
+        self._direction_state = _DIRECTION_IDLE
+        self._direction_flip_candidate = -1
         self._direction_flip_evidence_deg = 0.0
         self._direction_flip_min_deg_marker = 10.0
         self._direction_flip_min_deg_other = 16.0
 
     @staticmethod
-    def _unwrap_delta(delta_deg: float) -> float:
-        if delta_deg > 180:
-            delta_deg -= 360
-        elif delta_deg < -180:
-            delta_deg += 360
-        return delta_deg
-
-    def _unwrap_delta_with_history(self, delta_deg: float) -> float:
-        base = self._unwrap_delta(delta_deg)
-        prev = float(self._previous_delta_deg)
-        if abs(prev) < 0.8:
-            return base
-
-        alt = base + 360.0 if base < 0 else base - 360.0
-        if abs(alt - prev) + 12.0 < abs(base - prev):
-            return alt
-        return base
+    def _build_marker_luts(
+        ranges: Sequence[Tuple[np.ndarray, np.ndarray]],
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        # Each range owns one bit in per-channel LUTs, so a pixel matches range r exactly when bit r
+        # survives H & S & V. Up to eight fixed ranges then cost three LUT passes instead of inRange each.
+        if not 2 <= len(ranges) <= 8:
+            return None
+        h_lut = np.zeros(256, dtype=np.uint8)
+        s_lut = np.zeros(256, dtype=np.uint8)
+        v_lut = np.zeros(256, dtype=np.uint8)
+        for bit, (lower, upper) in enumerate(ranges):
+            flag = 1 << bit
+            h_lut[int(lower[0]) : int(upper[0]) + 1] |= flag
+            s_lut[int(lower[1]) : int(upper[1]) + 1] |= flag
+            v_lut[int(lower[2]) : int(upper[2]) + 1] |= flag
+        return h_lut, s_lut, v_lut
 
     def _resolve_direction(self, delta: float, rpm: float, source: str) -> str:
-        low_delta = abs(delta) < 0.8
-        low_rpm_hold = max(1.6, self.min_rpm_for_running * 0.28)
-        low_rpm_idle = max(1.2, self.min_rpm_for_running * 0.2)
-        if low_delta or rpm < low_rpm_hold:
-            if self._direction_state != "idle" and rpm >= low_rpm_idle:
-                return self._direction_state
-            self._direction_state = "idle"
-            self._direction_flip_candidate = None
-            self._direction_flip_evidence_deg = 0.0
-            return "idle"
-
-        instant = "forward" if delta > 0 else "reverse"
-        if self._direction_state in {"idle", instant}:
-            self._direction_state = instant
-            self._direction_flip_candidate = None
-            self._direction_flip_evidence_deg = 0.0
-            return instant
-
-        if self._direction_flip_candidate != instant:
-            self._direction_flip_candidate = instant
-            self._direction_flip_evidence_deg = abs(delta)
-        else:
-            self._direction_flip_evidence_deg += abs(delta)
-
         flip_threshold = (
             self._direction_flip_min_deg_marker
             if source == "marker"
             else self._direction_flip_min_deg_other
         )
-        if self._direction_flip_evidence_deg >= flip_threshold:
-            self._direction_state = instant
-            self._direction_flip_candidate = None
-            self._direction_flip_evidence_deg = 0.0
-            return instant
-
-        return self._direction_state
+        state, candidate, evidence = _direction_step(
+            self._direction_state,
+            self._direction_flip_candidate,
+            self._direction_flip_evidence_deg,
+            float(delta),
+            float(rpm),
+            self._low_rpm_hold,
+            self._low_rpm_idle,
+            float(flip_threshold),
+        )
+        self._direction_state = state
+        self._direction_flip_candidate = candidate
+        self._direction_flip_evidence_deg = evidence
+        return _DIRECTION_NAMES[state]
 
     @staticmethod
     def _sanitize_roi(frame_shape: Tuple[int, ...], roi: Sequence[int]) -> Tuple[int, int, int, int]:
@@ -159,16 +283,12 @@ class VirtualOdometer:
         )
 
     @staticmethod
-    def _dedupe_points(points: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
-        seen = set()
-        out: List[Tuple[int, int]] = []
-        for x, y in points:
-            key = (int(x), int(y))
-            if key in seen:
-                continue
-            seen.add(key)
-            out.append(key)
-        return out
+    def _dedupe_points(points: np.ndarray) -> np.ndarray:
+        # First occurrence of each vertex, in the original order.
+        if len(points) < 2:
+            return points
+        _, first_idx = np.unique(points, axis=0, return_index=True)
+        return points[np.sort(first_idx)]
 
     def _normalize_wheel_polygon(
         self,
@@ -177,22 +297,33 @@ class VirtualOdometer:
         wheel_polygon: Optional[Sequence[Sequence[int]]],
     ) -> np.ndarray:
         frame_h, frame_w = frame_shape[:2]
-        points: List[Tuple[int, int]] = []
+        points = np.zeros((0, 2), dtype=np.int32)
         if wheel_polygon is not None:
-            for point in wheel_polygon:
-                if len(point) != 2:
-                    continue
-                try:
-                    x = int(round(float(point[0])))
-                    y = int(round(float(point[1])))
-                except (TypeError, ValueError):
-                    continue
-                x = max(0, min(x, frame_w - 1))
-                y = max(0, min(y, frame_h - 1))
-                points.append((x, y))
+            # Runs every frame, so well-formed input takes a vectorised path; anything ragged or
+            # non-numeric falls back to filtering point by point.
+            try:
+                raw = np.asarray(wheel_polygon, dtype=np.float64)
+            except (TypeError, ValueError):
+                raw = None
+            if raw is not None and raw.ndim == 2 and raw.shape[1] == 2 and np.isfinite(raw).all():
+                upper = np.array([frame_w - 1, frame_h - 1], dtype=np.float64)
+                points = np.clip(np.rint(raw), 0.0, upper).astype(np.int32)
+            else:
+                kept: List[Tuple[int, int]] = []
+                for point in wheel_polygon:
+                    if len(point) != 2:
+                        continue
+                    try:
+                        x = int(round(float(point[0])))
+                        y = int(round(float(point[1])))
+                    except (TypeError, ValueError):
+                        continue
+                    kept.append((max(0, min(x, frame_w - 1)), max(0, min(y, frame_h - 1))))
+                if kept:
+                    points = np.array(kept, dtype=np.int32)
         points = self._dedupe_points(points)
         if len(points) >= 3:
-            return np.array(points, dtype=np.int32)
+            return points
 
         x, y, w, h = self._sanitize_roi(frame_shape, wheel_roi)
         return self._roi_polygon((x, y, w, h))
@@ -211,7 +342,7 @@ class VirtualOdometer:
 
         self._wheel_geometry_key = geometry_key
         self._wheel_polygon = polygon
-        self._texture_prev_ring = None
+        self._texture_prev_spectrum = None
         self._texture_virtual_angle = None
 
         x, y, w, h = cv2.boundingRect(polygon)
@@ -227,6 +358,14 @@ class VirtualOdometer:
         local_poly[:, 1] -= y
         self._wheel_mask_local = np.zeros((h, w), dtype=np.uint8)
         cv2.fillPoly(self._wheel_mask_local, [local_poly], 255)
+        self._wheel_pixel_count = int(cv2.countNonZero(self._wheel_mask_local))
+        self._wheel_mask_half = np.ascontiguousarray(self._wheel_mask_local[::2, ::2])
+        # Marker masks are patch-sized and rebuilt every frame; keep their buffers with the geometry.
+        self._marker_mask_buf = np.empty((h, w), dtype=np.uint8)
+        self._marker_tmp_buf = np.empty((h, w), dtype=np.uint8)
+        self._adaptive_mask_buf = np.empty((h, w), dtype=np.uint8)
+        self._hsv_buf = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray_buf = np.empty((h, w), dtype=np.uint8)
 
         center_x = x + w / 2.0
         center_y = y + h / 2.0
@@ -253,6 +392,44 @@ class VirtualOdometer:
         self._ellipse_center = (float(center_x), float(center_y))
         self._ellipse_axes = (float(axis_x), float(axis_y))
         self._ellipse_angle_rad = math.radians(float(angle_deg))
+        cos_a = math.cos(self._ellipse_angle_rad)
+        sin_a = math.sin(self._ellipse_angle_rad)
+        inv_ax = 1.0 / max(self._ellipse_axes[0], 1e-6)
+        inv_ay = 1.0 / max(self._ellipse_axes[1], 1e-6)
+        a, b = cos_a * inv_ax, sin_a * inv_ax
+        d, e = -sin_a * inv_ay, cos_a * inv_ay
+        cx, cy = self._ellipse_center
+        self._unit_circle_affine = (a, b, -(a * cx + b * cy), d, e, -(d * cx + e * cy))
+        self._ring_map_x, self._ring_map_y = self._build_texture_ring_maps(x, y, w, h)
+
+    def _build_texture_ring_maps(
+        self,
+        x: int,
+        y: int,
+        w: int,
+        h: int,
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        cx_local = self._ellipse_center[0] - x
+        cy_local = self._ellipse_center[1] - y
+        if not (math.isfinite(cx_local) and math.isfinite(cy_local)):
+            return None, None
+        if not (0 <= cx_local < w and 0 <= cy_local < h):
+            return None, None
+
+        max_radius = int(max(8.0, min(self._ellipse_axes) * 0.98))
+        if max_radius <= 8:
+            return None, None
+        inner = int(max(4, max_radius * 0.45))
+        outer = int(max(inner + 2, max_radius * 0.95))
+        if outer - inner < 3:
+            return None, None
+
+        # Degrees run counter-clockwise with y up, matching the marker angle convention.
+        theta = np.deg2rad(np.arange(_TEXTURE_RING_COLUMNS, dtype=np.float64) * (360.0 / _TEXTURE_RING_COLUMNS))
+        radii = np.arange(inner, outer, dtype=np.float64)[:, None]
+        map_x = (cx_local + radii * np.cos(theta)).astype(np.float32)
+        map_y = (cy_local - radii * np.sin(theta)).astype(np.float32)
+        return map_x, map_y
 
     def _wheel_patch(self, frame: np.ndarray) -> Optional[Tuple[np.ndarray, int, int]]:
         x, y, w, h = self._wheel_bbox
@@ -263,49 +440,54 @@ class VirtualOdometer:
             return None
         return patch, x, y
 
-    def _point_to_unit_circle(self, x: float, y: float) -> Tuple[float, float]:
-        dx = x - self._ellipse_center[0]
-        dy = y - self._ellipse_center[1]
-        cos_a = math.cos(self._ellipse_angle_rad)
-        sin_a = math.sin(self._ellipse_angle_rad)
-        xr = cos_a * dx + sin_a * dy
-        yr = -sin_a * dx + cos_a * dy
-        nx = xr / max(self._ellipse_axes[0], 1e-6)
-        ny = yr / max(self._ellipse_axes[1], 1e-6)
-        return nx, ny
-
-    def _angle_from_global_point(self, x: float, y: float) -> Optional[Tuple[float, float]]:
-        nx, ny = self._point_to_unit_circle(x, y)
-        radius = float(math.hypot(nx, ny))
-        if radius <= 1e-6:
-            return None
-        angle = (math.degrees(math.atan2(-ny, nx)) + 360.0) % 360.0
-        return float(angle), radius
+    @staticmethod
+    def _hist_percentile(cumulative: np.ndarray, q: float) -> float:
+        # np.percentile's linear interpolation, reading the two bracketing ranks off a uint8 histogram.
+        rank = (cumulative[-1] - 1) * q / 100.0
+        lo = int(rank)
+        low_value = float(np.searchsorted(cumulative, lo, side="right"))
+        high_value = float(np.searchsorted(cumulative, min(lo + 1, cumulative[-1] - 1), side="right"))
+        return low_value + (high_value - low_value) * (rank - lo)
 
     def _adaptive_marker_mask(self, hsv: np.ndarray) -> np.ndarray:
-        mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
-        if self._wheel_mask_local is None:
-            return mask
-
-        wheel_pixels = self._wheel_mask_local > 0
-        if int(np.count_nonzero(wheel_pixels)) < 20:
+        if self._adaptive_mask_buf is None or self._adaptive_mask_buf.shape != hsv.shape[:2]:
+            self._adaptive_mask_buf = np.empty(hsv.shape[:2], dtype=np.uint8)
+        mask = self._adaptive_mask_buf
+        if (
+            self._wheel_mask_local is None
+            or self._wheel_pixel_count < 20
+            or hsv.shape[:2] != self._wheel_mask_local.shape
+        ):
+            mask.fill(0)
             return mask
 
-        sat = hsv[:, :, 1]
-        val = hsv[:, :, 2]
-        sat_values = sat[wheel_pixels]
-        val_values = val[wheel_pixels]
-        sat_threshold = int(np.clip(np.percentile(sat_values, 82), 34, 220))
-        val_threshold = int(np.clip(np.percentile(val_values, 32), 20, 225))
-
-        sat_mask = cv2.inRange(sat, sat_threshold, 255)
-        val_mask = cv2.inRange(val, val_threshold, 255)
-        cv2.bitwise_and(sat_mask, val_mask, dst=mask)
-        cv2.bitwise_and(mask, self._wheel_mask_local, dst=mask)
-        cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._marker_kernel_3, dst=mask, iterations=1)
-        cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._marker_kernel_3, dst=mask, iterations=1)
+        # The percentiles are robust statistics, so on larger wheels every other row and column
+        # is enough; the thresholds are still applied to the full-resolution patch below.
+        stats_hsv = hsv
+        stats_mask = self._wheel_mask_local
+        if self._wheel_pixel_count >= 400 and self._wheel_mask_half is not None:
+            stats_hsv = hsv[::2, ::2]
+            stats_mask = self._wheel_mask_half
+        sat_cumulative = np.cumsum(cv2.calcHist([stats_hsv], [1], stats_mask, [256], [0, 256]).ravel())
+        val_cumulative = np.cumsum(cv2.calcHist([stats_hsv], [2], stats_mask, [256], [0, 256]).ravel())
+        sat_threshold = int(np.clip(self._hist_percentile(sat_cumulative, 82), 34, 220))
+        val_threshold = int(np.clip(self._hist_percentile(val_cumulative, 32), 20, 225))
+
+        if NUMBA_AVAILABLE:
+            _fused_sv_mask(hsv, self._wheel_mask_local, sat_threshold, val_threshold, mask)
+        else:
+            val_mask = cv2.inRange(hsv[:, :, 2], val_threshold, 255, dst=self._marker_tmp_buf)
+            cv2.inRange(hsv[:, :, 1], sat_threshold, 255, dst=mask)
+            cv2.bitwise_and(mask, val_mask, dst=mask)
+            cv2.bitwise_and(mask, self._wheel_mask_local, dst=mask)
+        if cv2.countNonZero(mask):
+            cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._marker_kernel_3, dst=mask, iterations=1)
+            cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._marker_kernel_3, dst=mask, iterations=1)
         return mask
 
+    def _min_marker_area(self, patch: np.ndarray) -> float:
+        return max(4.0, float(patch.shape[0] * patch.shape[1]) * self._min_marker_area_ratio)
+
     def _best_marker_angle_from_mask(
         self,
         marker_mask: np.ndarray,
@@ -316,97 +498,116 @@ class VirtualOdometer:
         *,
         from_adaptive: bool,
     ) -> Optional[float]:
-        contours, _ = cv2.findContours(marker_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if not contours:
+        # Connected components give every blob's area, bbox and centroid in one call; saturation is
+        # only summed inside the bbox of blobs that survive the cheaper area and radius checks.
+        count, labels, stats, centroids = cv2.connectedComponentsWithStats(marker_mask, connectivity=8)
+        if count < 2:
             return None
 
         patch_area = float(patch.shape[0] * patch.shape[1])
-        min_area = max(4.0, patch_area * self._min_marker_area_ratio)
+        min_area = self._min_marker_area(patch)
         max_area = max(min_area * 2.0, patch_area * self._max_marker_area_ratio)
-        sat_channel = hsv[:, :, 1]
-        contour_mask = np.zeros(marker_mask.shape, dtype=np.uint8)
-
-        best_angle: Optional[float] = None
-        best_score = -1.0
-
-        for contour in contours:
-            area = float(cv2.contourArea(contour))
-            if area < min_area or area > max_area:
-                continue
-
-            moments = cv2.moments(contour)
-            if moments["m00"] == 0:
-                continue
-
-            cx = (moments["m10"] / moments["m00"]) + x0
-            cy = (moments["m01"] / moments["m00"]) + y0
-            angle_info = self._angle_from_global_point(cx, cy)
-            if angle_info is None:
-                continue
-            angle, radius = angle_info
-            if radius < 0.38 or radius > 1.58:
-                continue
-
-            contour_mask.fill(0)
-            cv2.drawContours(contour_mask, [contour], -1, 255, thickness=-1)
-            sat_mean = float(cv2.mean(sat_channel, mask=contour_mask)[0])
-
-            rim_score = max(0.0, 1.6 - abs(radius - 0.95) * 2.2)
-            continuity_score = 0.0
-            predicted_score = 0.0
-            if self._previous_angle is not None:
-                continuity_err = abs(self._unwrap_delta(angle - self._previous_angle))
-                continuity_score = max(0.0, 1.0 - continuity_err / 150.0)
-                if abs(self._previous_delta_deg) > 0.1:
-                    predicted = (self._previous_angle + self._previous_delta_deg + 360.0) % 360.0
-                    predicted_err = abs(self._unwrap_delta(angle - predicted))
-                    predicted_score = max(0.0, 1.0 - predicted_err / 80.0)
-
-            chroma_base = 36.0 if from_adaptive else 24.0
-            chroma_scale = 52.0 if from_adaptive else 96.0
-            chroma_score = max(0.0, (sat_mean - chroma_base) / chroma_scale)
-            area_score = min(10.0, math.sqrt(area))
-            score = area_score + rim_score * 2.0 + continuity_score + predicted_score + chroma_score
-            if score > best_score:
-                best_score = score
-                best_angle = float(angle)
-
-        min_score = 2.4 if from_adaptive else 1.6
-        if best_score < min_score:
+        areas = stats[:, cv2.CC_STAT_AREA]
+        candidates = np.flatnonzero((areas[1:] >= min_area) & (areas[1:] <= max_area)) + 1
+        if candidates.size == 0:
             return None
-        return best_angle
-
-    def _detect_marker_angle(self, frame: np.ndarray) -> Optional[float]:
-        patch_info = self._wheel_patch(frame)
-        if patch_info is None or self._wheel_mask_local is None:
+        # Rim angle and radius for every candidate at once; only blobs near the rim are scored.
+        a, b, c, d, e, f = self._unit_circle_affine
+        cand_x = centroids[candidates, 0] + x0
+        cand_y = centroids[candidates, 1] + y0
+        nx = a * cand_x + b * cand_y + c
+        ny = d * cand_x + e * cand_y + f
+        radii = np.hypot(nx, ny)
+        on_rim = (radii >= 0.38) & (radii <= 1.58)
+        if not on_rim.any():
             return None
-        patch, x0, y0 = patch_info
-
-        hsv = cv2.cvtColor(patch, cv2.COLOR_BGR2HSV)
-        configured_mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
+        labels_on_rim = candidates[on_rim]
+        radii = radii[on_rim]
+        angles = (np.degrees(np.arctan2(-ny[on_rim], nx[on_rim])) + 360.0) % 360.0
+        blob_areas = areas[labels_on_rim].astype(np.float64)
 
-        for lower, upper in self.marker_hsv_ranges:
-            cv2.bitwise_or(configured_mask, cv2.inRange(hsv, lower, upper), dst=configured_mask)
+        # Saturation is summed per blob inside its bbox; everything else is scored as arrays.
+        sat = hsv[:, :, 1]
+        sat_sums = np.empty(labels_on_rim.size, dtype=np.float64)
+        for i, label in enumerate(labels_on_rim.tolist()):
+            left, top, width, height = stats[label, :4].tolist()
+            in_blob = labels[top : top + height, left : left + width] == label
+            sat_sums[i] = sat[top : top + height, left : left + width][in_blob].sum()
+
+        chroma_base = 36.0 if from_adaptive else 24.0
+        chroma_scale = 52.0 if from_adaptive else 96.0
+        scores = np.minimum(10.0, np.sqrt(blob_areas))
+        scores += np.maximum(0.0, 1.6 - np.abs(radii - 0.95) * 2.2) * 2.0
+        scores += np.maximum(0.0, (sat_sums / blob_areas - chroma_base) / chroma_scale)
+        previous_angle = self._previous_angle
+        if previous_angle is not None:
+            # Angular distances wrapped into [-180, 180) before taking abs().
+            continuity_err = np.abs((angles - previous_angle + 180.0) % 360.0 - 180.0)
+            scores += np.maximum(0.0, 1.0 - continuity_err / 150.0)
+            if abs(self._previous_delta_deg) > 0.1:
+                predicted = (previous_angle + self._previous_delta_deg + 360.0) % 360.0
+                predicted_err = np.abs((angles - predicted + 180.0) % 360.0 - 180.0)
+                scores += np.maximum(0.0, 1.0 - predicted_err / 80.0)
+
+        best = int(np.argmax(scores))
+        min_score = 2.4 if from_adaptive else 1.6
+        if scores[best] < min_score:
+            return None
+        return float(angles[best])
+
+    def _wheel_hsv(self, patch: np.ndarray) -> np.ndarray:
+        if self._hsv_buf is None or self._hsv_buf.shape[:2] != patch.shape[:2]:
+            self._hsv_buf = np.empty((*patch.shape[:2], 3), dtype=np.uint8)
+        return cv2.cvtColor(patch, cv2.COLOR_BGR2HSV, dst=self._hsv_buf)
+
+    def _detect_marker_angle(self, patch: np.ndarray, hsv: np.ndarray, x0: int, y0: int) -> Optional[float]:
+        if self._marker_mask_buf is None or self._marker_mask_buf.shape != hsv.shape[:2]:
+            self._marker_mask_buf = np.empty(hsv.shape[:2], dtype=np.uint8)
+            self._marker_tmp_buf = np.empty(hsv.shape[:2], dtype=np.uint8)
+        configured_mask = self._marker_mask_buf
+        scratch = self._marker_tmp_buf
+
+        if self._marker_luts is not None:
+            h_lut, s_lut, v_lut = self._marker_luts
+            h_channel, s_channel, v_channel = cv2.split(hsv)
+            cv2.LUT(h_channel, h_lut, dst=configured_mask)
+            cv2.bitwise_and(configured_mask, cv2.LUT(s_channel, s_lut, dst=scratch), dst=configured_mask)
+            cv2.bitwise_and(configured_mask, cv2.LUT(v_channel, v_lut, dst=scratch), dst=configured_mask)
+            cv2.compare(configured_mask, 0, cv2.CMP_GT, dst=configured_mask)
+        elif self.marker_hsv_ranges:
+            lower, upper = self.marker_hsv_ranges[0]
+            cv2.inRange(hsv, lower, upper, dst=configured_mask)
+            for lower, upper in self.marker_hsv_ranges[1:]:
+                cv2.inRange(hsv, lower, upper, dst=scratch)
+                cv2.bitwise_or(configured_mask, scratch, dst=configured_mask)
+        else:
+            configured_mask.fill(0)
 
         cv2.bitwise_and(configured_mask, self._wheel_mask_local, dst=configured_mask)
-        cv2.morphologyEx(configured_mask, cv2.MORPH_CLOSE, self._marker_kernel_3, dst=configured_mask, iterations=1)
-        cv2.morphologyEx(configured_mask, cv2.MORPH_OPEN, self._marker_kernel_3, dst=configured_mask, iterations=1)
-
-        angle = self._best_marker_angle_from_mask(
-            configured_mask,
-            patch,
-            hsv,
-            x0,
-            y0,
-            from_adaptive=False,
-        )
-        if angle is not None:
-            return angle
+        # Most frames have no configured marker in view; an empty mask needs no cleanup or scoring.
+        configured_found = cv2.countNonZero(configured_mask) > 0
+        if configured_found:
+            cv2.morphologyEx(configured_mask, cv2.MORPH_CLOSE, self._marker_kernel_3, dst=configured_mask, iterations=1)
+            cv2.morphologyEx(configured_mask, cv2.MORPH_OPEN, self._marker_kernel_3, dst=configured_mask, iterations=1)
+
+            angle = self._best_marker_angle_from_mask(
+                configured_mask,
+                patch,
+                hsv,
+                x0,
+                y0,
+                from_adaptive=False,
+            )
+            if angle is not None:
+                return angle
 
         adaptive_mask = self._adaptive_marker_mask(hsv)
-        if np.any(configured_mask):
-            inverse_mask = cv2.bitwise_not(configured_mask)
+        if configured_found and cv2.countNonZero(configured_mask):
+            inverse_mask = cv2.bitwise_not(configured_mask, dst=scratch)
             cv2.bitwise_and(adaptive_mask, inverse_mask, dst=adaptive_mask)
+        # No blob can reach the minimum marker area if the whole mask has fewer pixels than that.
+        if cv2.countNonZero(adaptive_mask) < self._min_marker_area(patch):
+            return None
 
         return self._best_marker_angle_from_mask(
             adaptive_mask,
@@ -417,68 +618,45 @@ class VirtualOdometer:
             from_adaptive=True,
         )
 
-    def _extract_texture_ring(self, frame: np.ndarray) -> Optional[np.ndarray]:
-        patch_info = self._wheel_patch(frame)
-        if patch_info is None or self._wheel_mask_local is None:
+    def _texture_spectrum(self, hsv: np.ndarray) -> Optional[np.ndarray]:
+        if self._ring_map_x is None or self._ring_map_y is None:
             return None
-        patch, x0, y0 = patch_info
-
-        gray = cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY)
+        if self._gray_buf is None or self._gray_buf.shape != hsv.shape[:2]:
+            self._gray_buf = np.empty(hsv.shape[:2], dtype=np.uint8)
+        # The V channel stands in for luminance: the ring is histogram-equalised before phase
+        # correlation, and it saves a second colour conversion of the same patch.
+        gray = cv2.extractChannel(hsv, 2, dst=self._gray_buf)
         cv2.bitwise_and(gray, gray, mask=self._wheel_mask_local, dst=gray)
-        gray = cv2.GaussianBlur(gray, (3, 3), 0)
-
-        cx_local = self._ellipse_center[0] - x0
-        cy_local = self._ellipse_center[1] - y0
-        if (
-            not np.isfinite(cx_local)
-            or not np.isfinite(cy_local)
-            or cx_local < 0
-            or cy_local < 0
-            or cx_local >= gray.shape[1]
-            or cy_local >= gray.shape[0]
-        ):
-            return None
-
-        max_radius = int(max(8.0, min(self._ellipse_axes) * 0.98))
-        if max_radius <= 8:
-            return None
-
-        try:
-            polar = cv2.warpPolar(
-                gray,
-                (360, max_radius),
-                (float(cx_local), float(cy_local)),
-                float(max_radius),
-                cv2.WARP_POLAR_LINEAR,
-            )
-        except cv2.error:
-            return None
-
-        if polar is None or polar.size == 0:
-            return None
+        cv2.GaussianBlur(gray, (3, 3), 0, dst=gray)
 
-        inner = int(max(4, max_radius * 0.45))
-        outer = int(max(inner + 2, max_radius * 0.95))
-        ring = polar[inner:outer, :]
-        if ring is None or ring.size == 0 or ring.shape[0] < 3:
-            return None
-        ring = cv2.equalizeHist(ring)
-        return np.float32(ring)
+        ring = cv2.remap(gray, self._ring_map_x, self._ring_map_y, cv2.INTER_LINEAR, dst=self._ring_buf)
+        self._ring_buf = ring
+        cv2.equalizeHist(ring, dst=ring)
+        profile = cv2.reduce(ring, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32F).ravel()
+        return np.fft.rfft(profile)
 
-    def _estimate_texture_delta(self, current_ring: Optional[np.ndarray]) -> Optional[float]:
-        if current_ring is None or self._texture_prev_ring is None:
-            return None
-        if current_ring.shape != self._texture_prev_ring.shape:
+    def _estimate_texture_delta(self, current: Optional[np.ndarray]) -> Optional[float]:
+        previous = self._texture_prev_spectrum
+        if current is None or previous is None or current.shape != previous.shape:
             return None
 
-        shift, response = cv2.phaseCorrelate(self._texture_prev_ring, current_ring)
-        shift_x = float(shift[0])
-        if not np.isfinite(shift_x) or not np.isfinite(response):
-            return None
-        if response < 0.05:
+        # 1-D phase correlation on the periodic angular profile; no window, since the ring wraps.
+        cross = current * np.conj(previous)
+        cross /= np.abs(cross) + 1e-9
+        cross[0] = 0.0
+        corr = np.fft.irfft(cross, n=_TEXTURE_RING_COLUMNS)
+        peak = int(np.argmax(corr))
+        response = float(corr[peak])
+        if not np.isfinite(response) or response < 0.05:
             return None
-
-        delta_angle = shift_x * (360.0 / max(current_ring.shape[1], 1))
+        left = float(corr[peak - 1])
+        right = float(corr[(peak + 1) % _TEXTURE_RING_COLUMNS])
+        curvature = left - 2.0 * response + right
+        shift_x = peak + (0.5 * (left - right) / curvature if abs(curvature) > 1e-12 else 0.0)
+        if shift_x > _TEXTURE_RING_COLUMNS / 2:
+            shift_x -= _TEXTURE_RING_COLUMNS
+
+        delta_angle = shift_x * (360.0 / _TEXTURE_RING_COLUMNS)
         if not np.isfinite(delta_angle) or abs(delta_angle) > 95.0:
             return None
         if abs(delta_angle) < 0.06:
@@ -494,9 +672,18 @@ class VirtualOdometer:
     ) -> OdometerMetrics:
         self._refresh_wheel_geometry(frame.shape, wheel_roi, wheel_polygon)
 
-        marker_angle = self._detect_marker_angle(frame)
-        texture_ring = self._extract_texture_ring(frame)
-        texture_delta = self._estimate_texture_delta(texture_ring)
+        marker_angle: Optional[float] = None
+        texture_spectrum: Optional[np.ndarray] = None
+        patch_info = self._wheel_patch(frame) if self._wheel_mask_local is not None else None
+        if patch_info is not None:
+            patch, x0, y0 = patch_info
+            hsv = self._wheel_hsv(patch)
+            marker_angle = self._detect_marker_angle(patch, hsv, x0, y0)
+            if marker_angle is None or self._frame_counter % self._texture_refresh_every == 0:
+                texture_spectrum = self._texture_spectrum(hsv)
+        texture_delta: Optional[float] = None
+        if marker_angle is None and self._texture_ring_frame == self._frame_counter - 1:
+            texture_delta = self._estimate_texture_delta(texture_spectrum)
         angle = marker_angle
         source = "marker"
         if angle is None and texture_delta is not None:
@@ -510,8 +697,10 @@ class VirtualOdometer:
             source = "predict"
 
         self._marker_missing_streak = 0 if marker_angle is not None else self._marker_missing_streak + 1
-        if texture_ring is not None:
-            self._texture_prev_ring = texture_ring
+        if texture_spectrum is not None:
+            self._texture_prev_spectrum = texture_spectrum
+            self._texture_ring_frame = self._frame_counter
+        self._frame_counter += 1
         if angle is not None:
             self._texture_virtual_angle = float(angle)
 
@@ -519,7 +708,7 @@ class VirtualOdometer:
             self._previous_timestamp = timestamp
             self._previous_delta_deg = 0.0
             return OdometerMetrics(
-                timestamp=timestamp.isoformat(),
+                timestamp=timestamp,
                 angle_deg=float(self._previous_angle or 0.0),
                 delta_angle_deg=0.0,
                 rpm=0.0,
@@ -537,7 +726,7 @@ class VirtualOdometer:
             self._previous_angle = float(angle)
             self._previous_delta_deg = 0.0
             return OdometerMetrics(
-                timestamp=timestamp.isoformat(),
+                timestamp=timestamp,
                 angle_deg=float(angle),
                 delta_angle_deg=0.0,
                 rpm=0.0,
@@ -547,33 +736,24 @@ class VirtualOdometer:
                 direction="idle",
                 running=False,
                 running_streak_s=0.0,
-                stop_go_frequency_per_min=float(len(self._state_switches)),
+                stop_go_frequency_per_min=float(self._state_switch_count),
             )
 
         dt = max((timestamp - self._previous_timestamp).total_seconds(), 1e-6)
-        raw_delta = angle - self._previous_angle
-        delta = self._unwrap_delta_with_history(raw_delta)
-        max_delta = max(24.0, self._max_reliable_rpm * 6.0 * dt)
-
-        if abs(delta) > max_delta:
-            if source == "marker":
-                delta = math.copysign(max_delta, delta)
-            elif source == "texture":
-                if abs(self._previous_delta_deg) > 0.1:
-                    delta = math.copysign(min(max_delta, abs(self._previous_delta_deg) * 1.4), delta)
-                else:
-                    delta = math.copysign(max_delta, delta)
-            else:
-                delta = 0.0
-        if abs(delta) < 0.35:
-            delta = 0.0
-        if delta * self._previous_delta_deg > 0:
-            delta = delta * 0.72 + self._previous_delta_deg * 0.28
-
-        revolutions_delta = delta / 360.0
-        self._total_revolutions_net += revolutions_delta
-        self._total_revolutions_abs += abs(revolutions_delta)
-        rpm = abs(revolutions_delta) * (60.0 / dt)
+        delta, revolutions_delta, rpm = _odometer_step(
+            float(angle),
+            float(self._previous_angle),
+            float(self._previous_delta_deg),
+            dt,
+            self._max_delta_deg_per_s,
+            _SOURCE_CODES[source],
+        )
+        self._revolutions_net_whole, self._revolutions_net_frac = self._carry_revolutions(
+            self._revolutions_net_whole, self._revolutions_net_frac, revolutions_delta
+        )
+        self._revolutions_abs_whole, self._revolutions_abs_frac = self._carry_revolutions(
+            self._revolutions_abs_whole, self._revolutions_abs_frac, abs(revolutions_delta)
+        )
         speed_kmh = self._speed_from_delta(revolutions_delta, dt)
         direction = self._resolve_direction(delta, rpm, source)
 
@@ -583,12 +763,17 @@ class VirtualOdometer:
         else:
             self._running_streak_s = 0.0
 
-        if running != self._previous_running:
-            self._state_switches.append(timestamp.timestamp())
-
-        cutoff = timestamp.timestamp() - 60.0
-        while self._state_switches and self._state_switches[0] < cutoff:
-            self._state_switches.popleft()
+        switched = running != self._previous_running
+        if switched or (self._state_switch_expiry is not None and timestamp >= self._state_switch_expiry):
+            ts_epoch = timestamp.timestamp()
+            if switched:
+                self._push_state_switch(ts_epoch)
+            self._prune_state_switches(ts_epoch - 60.0)
+            self._state_switch_expiry = None
+            if self._state_switch_count:
+                oldest = (self._state_switch_head - self._state_switch_count) % STATE_SWITCH_CAPACITY
+                remaining_s = float(self._state_switches[oldest]) + 60.0 - ts_epoch
+                self._state_switch_expiry = timestamp + timedelta(seconds=remaining_s)
 
         self._previous_running = running
         self._previous_timestamp = timestamp
@@ -596,7 +781,7 @@ class VirtualOdometer:
         self._previous_delta_deg = float(delta)
 
         return OdometerMetrics(
-            timestamp=timestamp.isoformat(),
+            timestamp=timestamp,
             angle_deg=float(angle),
             delta_angle_deg=float(delta),
             rpm=float(rpm),
@@ -606,12 +791,41 @@ class VirtualOdometer:
             direction=direction,
             running=running,
             running_streak_s=float(self._running_streak_s),
-            stop_go_frequency_per_min=float(len(self._state_switches)),
+            stop_go_frequency_per_min=float(self._state_switch_count),
         )
 
+    def _push_state_switch(self, ts_epoch: float) -> None:
+        head = self._state_switch_head
+        self._state_switches[head] = ts_epoch
+        self._state_switch_head = (head + 1) % STATE_SWITCH_CAPACITY
+        if self._state_switch_count < STATE_SWITCH_CAPACITY:
+            self._state_switch_count += 1
+
+    def _prune_state_switches(self, cutoff: float) -> None:
+        # Entries are in time order, so drop from the oldest end until one is recent enough.
+        count = self._state_switch_count
+        oldest = (self._state_switch_head - count) % STATE_SWITCH_CAPACITY
+        while count and self._state_switches[oldest] < cutoff:
+            oldest = (oldest + 1) % STATE_SWITCH_CAPACITY
+            count -= 1
+        self._state_switch_count = count
+
+    @staticmethod
+    def _carry_revolutions(whole: int, frac: float, delta: float) -> Tuple[int, float]:
+        frac += delta
+        carry = math.floor(frac)
+        return whole + carry, frac - carry
+
+    @property
+    def _total_revolutions_abs(self) -> float:
+        return self._revolutions_abs_whole + self._revolutions_abs_frac
+
+    @property
+    def _total_revolutions_net(self) -> float:
+        return self._revolutions_net_whole + self._revolutions_net_frac
+
     def _distance_from_revolutions(self, revolutions: float) -> float:
         return max(float(revolutions), 0.0) * self._wheel_circumference_m
 
     def _speed_from_delta(self, revolutions_delta: float, dt_seconds: float) -> float:
-        meters_per_second = abs(revolutions_delta) * self._wheel_circumference_m / dt_seconds
-        return meters_per_second * 3.6
+        return abs(revolutions_delta) * self._speed_scale / dt_seconds
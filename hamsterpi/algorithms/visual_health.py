@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import json
+import math
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Any, Dict, Iterable, Optional
@@ -10,6 +11,51 @@ import cv2
 import numpy as np
 import requests
 
+from ._jit import NUMBA_AVAILABLE, njit, prange
+
+# sRGB -> linear lookup, as OpenCV applies before its 8-bit BGR2LAB conversion.
+_SRGB_TO_LINEAR = np.array(
+    [c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4 for c in (i / 255.0 for i in range(256))],
+    dtype=np.float32,
+)
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _lab_laplacian_std(bgr: np.ndarray, to_linear: np.ndarray) -> float:
+    # std of the 4-neighbour Laplacian of 8-bit LAB lightness (reflect-101 borders), without
+    # materialising the LAB image or a float64 Laplacian.
+    height, width = bgr.shape[0], bgr.shape[1]
+    light = np.empty((height, width), dtype=np.float32)
+    for i in prange(height):
+        for j in range(width):
+            y = (
+                0.072169 * to_linear[bgr[i, j, 0]]
+                + 0.715160 * to_linear[bgr[i, j, 1]]
+                + 0.212671 * to_linear[bgr[i, j, 2]]
+            )
+            fy = y ** (1.0 / 3.0) if y > 0.008856 else 7.787 * y + 16.0 / 116.0
+            light[i, j] = round((116.0 * fy - 16.0) * 2.55)
+
+    total = 0.0
+    total_sq = 0.0
+    for i in prange(height):
+        up = i - 1 if i > 0 else min(1, height - 1)
+        down = i + 1 if i < height - 1 else max(height - 2, 0)
+        row_sum = 0.0
+        row_sq = 0.0
+        for j in range(width):
+            left = j - 1 if j > 0 else min(1, width - 1)
+            right = j + 1 if j < width - 1 else max(width - 2, 0)
+            lap = light[up, j] + light[down, j] + light[i, left] + light[i, right] - 4.0 * light[i, j]
+            row_sum += lap
+            row_sq += lap * lap
+        total += row_sum
+        total_sq += row_sq
+
+    count = height * width
+    mean = total / count
+    return math.sqrt(max(total_sq / count - mean * mean, 0.0))
+
 
 @dataclass
 class HealthMetrics:
@@ -31,14 +77,34 @@ class VisualHealthScanner:
     def __init__(self, baseline_body_area_px: int, vlm_config: Any) -> None:
         self.baseline_body_area_px = baseline_body_area_px
         self.vlm_config = vlm_config
+        self._close_kernel_3 = np.ones((3, 3), np.uint8)
         self._close_kernel_5 = np.ones((5, 5), np.uint8)
+        # The body blob is segmented at this width; areas are scaled back to input pixels.
+        self._body_area_width = 320
+        # Scan images usually share one size, so conversion targets are kept between scans.
+        self._gray_buf: Optional[np.ndarray] = None
+        self._small_gray_buf: Optional[np.ndarray] = None
+        self._binary_buf: Optional[np.ndarray] = None
+        self._hsv_buf: Optional[np.ndarray] = None
+        # Scans are minutes apart; a kept-alive session skips the TCP/TLS setup when the server allows it.
+        self._http = requests.Session()
 
     @staticmethod
     def _encode_image_b64(image: np.ndarray) -> str:
-        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 92])
+        height, width = image.shape[:2]
+        long_edge = max(height, width)
+        if long_edge > 768:
+            # VLM vision encoders tile at roughly this size, so extra pixels only cost upload and libjpeg time.
+            scale = 768 / long_edge
+            image = cv2.resize(
+                image,
+                (max(1, int(round(width * scale))), max(1, int(round(height * scale)))),
+                interpolation=cv2.INTER_AREA,
+            )
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 80, cv2.IMWRITE_JPEG_OPTIMIZE, 1])
         if not ok:
             raise ValueError("Failed to encode image")
-        return base64.b64encode(encoded.tobytes()).decode("ascii")
+        return base64.b64encode(memoryview(encoded)).decode("ascii")
 
     @staticmethod
     def _extract_json(raw_text: str) -> Dict[str, Any]:
@@ -52,29 +118,72 @@ class VisualHealthScanner:
                 return json.loads(raw_text[start : end + 1])
             raise
 
+    def _ensure_buffers(self, image: np.ndarray) -> None:
+        height, width = image.shape[:2]
+        if self._gray_buf is None or self._gray_buf.shape != (height, width):
+            self._gray_buf = np.empty((height, width), dtype=np.uint8)
+            self._hsv_buf = np.empty((height, width, 3), dtype=np.uint8)
+            if width > self._body_area_width:
+                small_height = max(1, int(round(height * self._body_area_width / width)))
+                self._small_gray_buf = np.empty((small_height, self._body_area_width), dtype=np.uint8)
+            else:
+                self._small_gray_buf = None
+            self._binary_buf = np.empty(
+                self._gray_buf.shape if self._small_gray_buf is None else self._small_gray_buf.shape,
+                dtype=np.uint8,
+            )
+
     def _heuristic_body_area(self, image: np.ndarray) -> int:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self._close_kernel_5, iterations=2)
+        self._ensure_buffers(image)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        if self._small_gray_buf is None:
+            work = cv2.GaussianBlur(gray, (5, 5), 0, dst=gray)
+            close_kernel, close_iterations = self._close_kernel_5, 2
+        else:
+            # Area averaging already low-passes the image, so the blur is dropped here.
+            work = cv2.resize(
+                gray,
+                (self._small_gray_buf.shape[1], self._small_gray_buf.shape[0]),
+                dst=self._small_gray_buf,
+                interpolation=cv2.INTER_AREA,
+            )
+            close_kernel, close_iterations = self._close_kernel_3, 1
+        _, binary = cv2.threshold(work, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=self._binary_buf)
+        cv2.morphologyEx(binary, cv2.MORPH_CLOSE, close_kernel, dst=binary, iterations=close_iterations)
 
+        # The outer contour's area includes enclosed holes (eyes, dark fur patches), unlike a pixel count.
         contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         if not contours:
             return self.baseline_body_area_px
-        area = max(cv2.contourArea(cnt) for cnt in contours)
+        largest = max(contours, key=cv2.contourArea)
+        area = cv2.contourArea(largest)
+        if binary.shape != gray.shape:
+            # contourArea runs through boundary pixel centres, losing about half a pixel per unit of
+            # perimeter; add back the part of that loss that the upscale would otherwise magnify.
+            scale_x = gray.shape[1] / binary.shape[1]
+            scale_y = gray.shape[0] / binary.shape[0]
+            scale = 0.5 * (scale_x + scale_y)
+            area = area * scale_x * scale_y + 0.5 * scale * (scale - 1.0) * cv2.arcLength(largest, True)
         return int(area)
 
     def _heuristic_fur_score(self, image: np.ndarray) -> float:
-        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-        l_channel = lab[:, :, 0]
-        smoothness = float(np.std(cv2.Laplacian(l_channel, cv2.CV_64F)))
+        if NUMBA_AVAILABLE and image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3 and image.size:
+            smoothness = float(_lab_laplacian_std(np.ascontiguousarray(image), _SRGB_TO_LINEAR))
+        else:
+            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+            l_channel = cv2.extractChannel(lab, 0)
+            # A 3x3 Laplacian of 8-bit input stays within +-1020, so int16 holds it exactly.
+            _, stddev = cv2.meanStdDev(cv2.Laplacian(l_channel, cv2.CV_16S))
+            smoothness = float(stddev[0, 0])
         score = max(0.0, min(1.0, 1.0 - smoothness / 120.0))
         return score
 
     def _heuristic_expression_score(self, image: np.ndarray) -> float:
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        brightness = float(np.mean(hsv[:, :, 2])) / 255.0
-        saturation = float(np.mean(hsv[:, :, 1])) / 255.0
+        self._ensure_buffers(image)
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=self._hsv_buf)
+        _, mean_s, mean_v, _ = cv2.mean(hsv)
+        brightness = mean_v / 255.0
+        saturation = mean_s / 255.0
         return max(0.0, min(1.0, brightness * 0.7 + (1.0 - saturation) * 0.3))
 
     @staticmethod
@@ -82,19 +191,23 @@ class VisualHealthScanner:
         if not keypoints:
             return 0.5
 
-        left_values = []
-        right_values = []
+        left_sum = right_sum = 0.0
+        left_count = right_count = 0
         for item in keypoints:
-            if "left_step" in item:
-                left_values.append(float(item["left_step"]))
-            if "right_step" in item:
-                right_values.append(float(item["right_step"]))
+            left = item.get("left_step")
+            if left is not None:
+                left_sum += float(left)
+                left_count += 1
+            right = item.get("right_step")
+            if right is not None:
+                right_sum += float(right)
+                right_count += 1
 
-        if not left_values or not right_values:
+        if not left_count or not right_count:
             return 0.5
 
-        left_mean = np.mean(left_values)
-        right_mean = np.mean(right_values)
+        left_mean = left_sum / left_count
+        right_mean = right_sum / right_count
         imbalance = abs(left_mean - right_mean) / max(left_mean, right_mean, 1e-6)
         return float(max(0.0, min(1.0, 1.0 - imbalance)))
 
@@ -133,7 +246,7 @@ class VisualHealthScanner:
         }
 
         headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        response = requests.post(
+        response = self._http.post(
             self.vlm_config.endpoint,
             headers=headers,
             json=payload,
@@ -152,6 +265,9 @@ class VisualHealthScanner:
 
         return self._extract_json(content)
 
+    def close(self) -> None:
+        self._http.close()
+
     @staticmethod
     def _risk_level(fur_score: float, expression_score: float, volume_ratio: float, gait_score: float) -> str:
         risk_score = (1 - fur_score) * 0.3 + (1 - expression_score) * 0.25 + abs(volume_ratio) * 1.8 + (1 - gait_score) * 0.3
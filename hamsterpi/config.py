@@ -7,6 +7,9 @@ from typing import Any, Dict, List, Tuple
 import yaml
 from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
 
+# libyaml's C loader parses the same safe subset; PyYAML builds without it fall back to the pure-Python one.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 Point = Tuple[int, int]
 Polygon = List[Point]
 
@@ -339,7 +342,7 @@ def load_raw_config(path: str | Path | None = None) -> Dict[str, Any]:
         raise ConfigError(f"Config file not found: {config_path}")
 
     with config_path.open("r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f) or {}
+        raw = yaml.load(f, Loader=_YAML_LOADER) or {}
     if not isinstance(raw, dict):
         raise ConfigError(f"Config root must be a mapping: {config_path}")
     return raw
@@ -3,8 +3,9 @@ from __future__ import annotations
 import math
 from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import FileResponse
@@ -27,22 +28,43 @@ app = FastAPI(title="HamsterPi Log Viewer", version="0.1.0")
 BASE_DIR = Path(__file__).resolve().parent.parent
 WEB_LOG_DIR = BASE_DIR / "web" / "logs"
 
-configure_logging(LoggingConfig())
 LOGGER = get_logger(__name__)
 
+# Settings the managed handlers were last built from; requests only rebuild them when these change.
+_applied_logging_key: Optional[Tuple[str, str, int, int, bool]] = None
+
 
 class LoggingConfigPayload(BaseModel):
     logging: Dict[str, Any] = Field(default_factory=dict)
 
 
-def _active_logging_config() -> LoggingConfig:
+@lru_cache(maxsize=1)
+def _load_logging_config(path: str, mtime_ns: int) -> LoggingConfig:
+    # mtime_ns is only part of the cache key, so an edited file is parsed again.
     try:
-        cfg = load_config(default_config_path())
-        return cfg.logging
+        return load_config(path).logging
     except ConfigError:
         return LoggingConfig()
 
 
+def _active_logging_config() -> LoggingConfig:
+    path = default_config_path()
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return LoggingConfig()
+    return _load_logging_config(str(path), mtime_ns)
+
+
+def _apply_logging_config(cfg: LoggingConfig) -> None:
+    global _applied_logging_key
+    key = (cfg.level, cfg.file_path, cfg.max_bytes, cfg.backup_count, cfg.console_enabled)
+    if key == _applied_logging_key:
+        return
+    configure_logging(cfg)
+    _applied_logging_key = key
+
+
 def _read_logging_config_from_raw() -> LoggingConfig:
     try:
         raw = load_raw_config(default_config_path())
@@ -187,6 +209,11 @@ def _performance_summary(records: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
+@app.on_event("startup")
+def on_startup() -> None:
+    _apply_logging_config(_active_logging_config())
+
+
 @app.get("/")
 def index() -> FileResponse:
     return FileResponse(WEB_LOG_DIR / "index.html")
@@ -195,14 +222,14 @@ def index() -> FileResponse:
 @app.get("/health")
 def health() -> Dict[str, str]:
     cfg = _active_logging_config()
-    configure_logging(cfg)
+    _apply_logging_config(cfg)
     return {"status": "ok", "time": datetime.now().isoformat(), "log_file": str(resolve_log_file(cfg.file_path))}
 
 
 @app.get("/api/config/logging")
 def get_logging_config() -> Dict[str, Any]:
     cfg = _read_logging_config_from_raw()
-    configure_logging(cfg)
+    _apply_logging_config(cfg)
     return {
         "config_path": str(default_config_path()),
         "logging": cfg.model_dump(),
@@ -229,7 +256,7 @@ def save_logging_config(payload: LoggingConfigPayload) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail=f"Invalid config after update: {exc}") from exc
 
     save_raw_config(raw, default_config_path())
-    configure_logging(logging_cfg)
+    _apply_logging_config(logging_cfg)
     LOGGER.info(
         "Log viewer updated logging config",
         extra={"context": {"config_path": str(default_config_path()), "level": logging_cfg.level}},
@@ -250,7 +277,7 @@ def get_logs(
     perf_only: bool = Query(default=False, description="Only performance-related logs"),
 ) -> Dict[str, Any]:
     cfg = _active_logging_config()
-    configure_logging(cfg)
+    _apply_logging_config(cfg)
     selected_levels = _parse_levels(levels)
     records = read_log_records(
         file_path=cfg.file_path,
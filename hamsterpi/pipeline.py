@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import base64
+import queue
+import threading
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
@@ -20,9 +23,10 @@ from hamsterpi.algorithms.visual_health import VisualHealthScanner
 from hamsterpi.config import SystemConfig
 from hamsterpi.logging_system import get_logger
 from hamsterpi.notifier import build_notifier
-from hamsterpi.video_capture import apply_video_orientation, open_video_capture
+from hamsterpi.video_capture import VideoOrientation, apply_video_orientation, open_video_capture
 
 LOGGER = get_logger(__name__)
+FRAME_PREFETCH_DEPTH = 2
 
 
 class HamsterVisionPipeline:
@@ -52,6 +56,9 @@ class HamsterVisionPipeline:
         scaled_fence = self._scale_polygon(config.spatial.fence_polygon)
         scaled_wheel_mask = self._scale_polygon(config.spatial.wheel_mask_polygon)
         self._wheel_polygon = scaled_wheel_mask
+        self._wheel_polygon_bbox: Optional[Tuple[int, int, int, int]] = None
+        if scaled_wheel_mask and len(scaled_wheel_mask) >= 3:
+            self._wheel_polygon_bbox = cv2.boundingRect(np.array(scaled_wheel_mask, dtype=np.int32))
         scaled_zones = {name: self._scale_polygon(poly) for name, poly in config.spatial.zones.items()}
         self._spatial_bev_homography, spatial_fence, spatial_zones = self._build_spatial_bev(scaled_fence, scaled_zones)
         self._spatial_bev_enabled = self._spatial_bev_homography is not None
@@ -129,6 +136,7 @@ class HamsterVisionPipeline:
         self._featured_candidates: List[Dict[str, Any]] = []
         self._featured_candidate_limit = 42
         self._analysis_frame_buffer: Optional[np.ndarray] = None
+        self._analyzer_executor: Optional[ThreadPoolExecutor] = None
 
     @staticmethod
     def _order_quad(points: np.ndarray) -> np.ndarray:
@@ -617,7 +625,7 @@ class HamsterVisionPipeline:
                     cv2.rectangle(subject_mask, (ix1, iy1), (ix2, iy2), 255, thickness=-1)
 
         min_subject_pixels = max(320, int(crop_w * crop_h * 0.018))
-        if int(np.count_nonzero(subject_mask)) < min_subject_pixels:
+        if int(cv2.countNonZero(subject_mask)) < min_subject_pixels:
             fallback_radius = int(
                 np.clip(
                     max(active_radius * raw_scale * 1.45, min(crop_w, crop_h) * 0.14),
@@ -802,9 +810,8 @@ class HamsterVisionPipeline:
         if frame_w < 2 or frame_h < 2:
             return analysis_frame, list(self._wheel_roi), list(self._wheel_polygon) if self._wheel_polygon else None
 
-        if self._wheel_polygon and len(self._wheel_polygon) >= 3:
-            polygon_arr = np.array(self._wheel_polygon, dtype=np.int32)
-            x, y, w, h = cv2.boundingRect(polygon_arr)
+        if self._wheel_polygon_bbox is not None:
+            x, y, w, h = self._wheel_polygon_bbox
         else:
             x, y, w, h = [int(v) for v in self._wheel_roi]
 
@@ -886,21 +893,6 @@ class HamsterVisionPipeline:
 
         dt = self._dt_seconds(timestamp)
 
-        odometer_metrics = self._update_odometer_on_analysis_frame(analysis_frame, timestamp)
-        spatial_metrics = self.spatial.update(analysis_frame, timestamp, dt).to_dict()
-
-        centroid_scaled = tuple(spatial_metrics["centroid"]) if spatial_metrics["centroid"] else None
-        centroid_output = centroid_scaled if self._spatial_bev_enabled else self._to_original_point(centroid_scaled)
-
-        behavior_metrics = self.behavior.update(
-            timestamp=timestamp,
-            dt_seconds=dt,
-            centroid=centroid_scaled,
-            action_probs=action_probs,
-            image=analysis_frame,
-            zone=str(spatial_metrics.get("in_zone", "")),
-        ).to_dict()
-
         scaled_transfer_points = None
         if transfer_points is not None:
             scaled_transfer_points = [
@@ -911,15 +903,41 @@ class HamsterVisionPipeline:
                 for point in transfer_points
             ]
 
-        inventory_metrics = self.inventory.update(
+        # Odometer, inventory and environment only read the analysis frame and share no state,
+        # and OpenCV releases the GIL, so they run alongside spatial/behavior on the other cores.
+        if self._analyzer_executor is None:
+            self._analyzer_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="pipeline-analyzer")
+        executor = self._analyzer_executor
+        odometer_future = executor.submit(self._update_odometer_on_analysis_frame, analysis_frame, timestamp)
+        inventory_future = executor.submit(
+            self.inventory.update,
             frame=analysis_frame,
             timestamp=timestamp,
             transfer_points=scaled_transfer_points,
+        )
+        environment_future = None
+        if self.config.environment.enabled and self._frame_index % self.config.environment.sample_every_nth_frame == 0:
+            environment_future = executor.submit(self.environment.update, analysis_frame, timestamp)
+
+        spatial_metrics = self.spatial.update(analysis_frame, timestamp, dt).to_dict()
+
+        centroid_scaled = tuple(spatial_metrics["centroid"]) if spatial_metrics["centroid"] else None
+        centroid_output = centroid_scaled if self._spatial_bev_enabled else self._to_original_point(centroid_scaled)
+
+        behavior_metrics = self.behavior.update(
+            timestamp=timestamp,
+            dt_seconds=dt,
+            centroid=centroid_scaled,
+            action_probs=action_probs,
+            image=analysis_frame,
+            zone=str(spatial_metrics.get("in_zone", "")),
         ).to_dict()
 
+        odometer_metrics = odometer_future.result()
+        inventory_metrics = inventory_future.result().to_dict()
         environment_metrics = None
-        if self.config.environment.enabled and self._frame_index % self.config.environment.sample_every_nth_frame == 0:
-            environment_metrics = self.environment.update(analysis_frame, timestamp).to_dict()
+        if environment_future is not None:
+            environment_metrics = environment_future.result().to_dict()
 
         if spatial_metrics["escape_detected"] and self.config.alerts.escape_enabled:
             self.notifier.notify(
@@ -954,6 +972,38 @@ class HamsterVisionPipeline:
             "health": health_metrics,
         }
 
+    @staticmethod
+    def _prefetch_frames(
+        cap: cv2.VideoCapture,
+        orientation: VideoOrientation,
+        frame_queue: queue.Queue,
+        stop_reading: threading.Event,
+        reader_errors: List[BaseException],
+    ) -> None:
+        try:
+            while not stop_reading.is_set():
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                frame = apply_video_orientation(frame, orientation)
+                while not stop_reading.is_set():
+                    try:
+                        frame_queue.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.error("Pipeline frame reader failed", extra={"context": {"error": str(exc)}})
+            # Handed back to process_video, which re-raises it instead of returning a truncated result.
+            reader_errors.append(exc)
+        finally:
+            while not stop_reading.is_set():
+                try:
+                    frame_queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
     def _frame_step(self, source_fps: float) -> int:
         if source_fps <= 0:
             return self.config.runtime.process_every_nth_frame
@@ -991,12 +1041,23 @@ class HamsterVisionPipeline:
         analyzed_count = 0
         skipped_count = 0
 
+        # Decode + orientation run on a reader thread so the next frame is ready while this one is analyzed.
+        frame_queue: queue.Queue = queue.Queue(maxsize=FRAME_PREFETCH_DEPTH)
+        stop_reading = threading.Event()
+        reader_errors: List[BaseException] = []
+        reader = threading.Thread(
+            target=self._prefetch_frames,
+            args=(cap, orientation, frame_queue, stop_reading, reader_errors),
+            name="pipeline-frame-reader",
+            daemon=True,
+        )
+        reader.start()
+
         try:
             while True:
-                ok, frame = cap.read()
-                if not ok:
+                frame = frame_queue.get()
+                if frame is None:
                     break
-                frame = apply_video_orientation(frame, orientation)
                 timestamp = start_time + timedelta(seconds=frame_idx / fps)
 
                 if frame_idx % step != 0:
@@ -1029,9 +1090,25 @@ class HamsterVisionPipeline:
                 if max_frames is not None and frame_idx >= max_frames:
                     break
         finally:
+            stop_reading.set()
+            while reader.is_alive():
+                # Unblock a reader waiting on a full queue.
+                try:
+                    frame_queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            reader.join()
             cap.release()
             if self.motion_analyzer is not None:
                 self.motion_analyzer.close()
+            self.behavior.close()
+            self.health.close()
+            if self._analyzer_executor is not None:
+                self._analyzer_executor.shutdown(wait=True)
+                self._analyzer_executor = None
+
+        if reader_errors:
+            raise reader_errors[0]
 
         trajectory = self.spatial.trajectory()
         if self.config.runtime.low_memory_mode and len(trajectory) > max_items:
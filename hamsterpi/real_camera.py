@@ -4,12 +4,14 @@ import gc
 import importlib
 import json
 import os
+import queue
 import select
 import shutil
 import subprocess
 import time
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from threading import Condition, Event, Lock, Thread
 from typing import Any, Optional, Protocol, TextIO, Tuple, Union
@@ -21,6 +23,14 @@ from hamsterpi.config import SystemConfig, project_root
 from hamsterpi.logging_system import get_logger
 
 LOGGER = get_logger(__name__)
+RECORD_WRITE_QUEUE_SIZE = 16
+# Motion masks are thresholded right after the downscale, so use the cheapest interpolation.
+MOTION_RESIZE_INTERP = cv2.INTER_NEAREST
+
+
+@lru_cache(maxsize=8)
+def _fourcc(codec: str) -> int:
+    return int(cv2.VideoWriter_fourcc(*codec))
 
 
 def _safe_status_text(value: str) -> str:
@@ -373,7 +383,10 @@ class RealCameraLoopService:
         self._error_count = 0
 
         self._writer: Optional[cv2.VideoWriter] = None
+        self._write_queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[Thread] = None
         self._writer_path: Optional[Path] = None
+        self._record_dir_ready: Optional[Path] = None
         self._writer_frame_log_path: Optional[Path] = None
         self._writer_meta_path: Optional[Path] = None
         self._writer_frame_log_file: Optional[TextIO] = None
@@ -813,9 +826,10 @@ class RealCameraLoopService:
         h, w = frame.shape[:2]
         target_w = min(max(64, int(downscale_width)), max(1, w))
         target_h = max(1, int(round(h * target_w / max(w, 1))))
-        resized = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_AREA)
+        resized = cv2.resize(frame, (target_w, target_h), interpolation=MOTION_RESIZE_INTERP)
         gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
-        cv2.GaussianBlur(gray, (blur_kernel, blur_kernel), 0, dst=gray)
+        if blur_kernel > 3:
+            cv2.boxFilter(gray, -1, (blur_kernel, blur_kernel), dst=gray)
         return gray
 
     @staticmethod
@@ -889,9 +903,9 @@ class RealCameraLoopService:
             return
 
         diff = cv2.absdiff(prev_gray, gray)
-        _, mask = cv2.threshold(diff, diff_threshold, 255, cv2.THRESH_BINARY)
+        mask = cv2.compare(diff, diff_threshold, cv2.CMP_GT)
         cv2.morphologyEx(mask, cv2.MORPH_OPEN, morph_kernel, dst=mask, iterations=1)
-        motion_pixels = int(np.count_nonzero(mask))
+        motion_pixels = int(cv2.countNonZero(mask))
         motion_ratio = float(motion_pixels) / float(max(mask.size, 1))
 
         with self._state_lock:
@@ -899,18 +913,14 @@ class RealCameraLoopService:
         if motion_ratio < min_motion_ratio:
             return
 
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if not contours:
+        count, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        if count < 2:
             return
-        contour = max(contours, key=cv2.contourArea)
-        area = float(cv2.contourArea(contour))
-        if area < 8.0:
+        largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+        if float(stats[largest, cv2.CC_STAT_AREA]) < 8.0:
             return
-        moments = cv2.moments(contour)
-        if moments.get("m00", 0.0) <= 1e-6:
-            return
-        cx = float(moments["m10"] / moments["m00"])
-        cy = float(moments["m01"] / moments["m00"])
+        cx = float(centroids[largest, 0])
+        cy = float(centroids[largest, 1])
 
         frame_h, frame_w = frame.shape[:2]
         scale_x = float(frame_w / max(mask.shape[1], 1))
@@ -949,32 +959,41 @@ class RealCameraLoopService:
 
         min_interval = 1.0 / float(max(settings.record_fps, 1))
         if self._last_record_written_monotonic <= 0.0 or now_mono - self._last_record_written_monotonic >= min_interval:
-            writer = self._writer
-            if writer is not None:
-                writer.write(frame)
-                self._record_frame_timestamp(now)
-                self._last_record_written_monotonic = now_mono
+            write_queue = self._write_queue
+            if write_queue is not None:
+                try:
+                    # Copy: the capture backend may reuse the buffer before the writer thread encodes it.
+                    write_queue.put_nowait(frame.copy())
+                except queue.Full:
+                    LOGGER.debug("Real loop recording dropped a frame, encoder is behind")
+                else:
+                    self._record_frame_timestamp(now)
+                    self._last_record_written_monotonic = now_mono
 
         if now_mono - self._record_started_monotonic >= float(settings.record_segment_seconds):
             self._rotate_writer(frame.shape[1], frame.shape[0], now, now_mono)
 
     def _open_writer(self, width: int, height: int, now: datetime, now_mono: float) -> None:
         settings = self._settings
-        settings.record_output_dir.mkdir(parents=True, exist_ok=True)
+        if settings.record_output_dir != self._record_dir_ready:
+            settings.record_output_dir.mkdir(parents=True, exist_ok=True)
+            self._record_dir_ready = settings.record_output_dir
         target_path = settings.record_output_dir / f"loop_{now.strftime('%Y%m%d_%H%M%S')}.mp4"
         frame_log_path = Path(f"{target_path.as_posix()}.frames.jsonl")
         meta_path = Path(f"{target_path.as_posix()}.meta.json")
 
         codec = str(settings.record_codec or "mp4v")[:4].ljust(4, "v")
-        fourcc = cv2.VideoWriter_fourcc(*codec)
+        fourcc = _fourcc(codec)
         writer = cv2.VideoWriter(target_path.as_posix(), fourcc, float(settings.record_fps), (int(width), int(height)))
         if not writer.isOpened() and codec.lower() != "mp4v":
             writer.release()
             codec = "mp4v"
-            fourcc = cv2.VideoWriter_fourcc(*codec)
+            fourcc = _fourcc(codec)
             writer = cv2.VideoWriter(target_path.as_posix(), fourcc, float(settings.record_fps), (int(width), int(height)))
         if not writer.isOpened():
             writer.release()
+            # The directory may have been removed underneath us; recreate it on the next attempt.
+            self._record_dir_ready = None
             raise RuntimeError("failed to open loop recorder")
 
         try:
@@ -983,7 +1002,18 @@ class RealCameraLoopService:
             writer.release()
             raise
 
+        write_queue: queue.Queue = queue.Queue(maxsize=RECORD_WRITE_QUEUE_SIZE)
+        writer_thread = Thread(
+            target=self._writer_loop,
+            args=(writer, write_queue),
+            name="real-camera-writer",
+            daemon=True,
+        )
+        writer_thread.start()
+
         self._writer = writer
+        self._write_queue = write_queue
+        self._writer_thread = writer_thread
         self._writer_path = target_path
         self._writer_frame_log_path = frame_log_path
         self._writer_meta_path = meta_path
@@ -998,6 +1028,17 @@ class RealCameraLoopService:
         self._segment_error_abs_max_ms = 0.0
         self._set_status("recording", opened=True, backend=self._backend_name, error="")
 
+    @staticmethod
+    def _writer_loop(writer: cv2.VideoWriter, write_queue: queue.Queue) -> None:
+        while True:
+            frame = write_queue.get()
+            if frame is None:
+                return
+            try:
+                writer.write(frame)
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.warning("Real loop recording write failed", extra={"context": {"error": str(exc)}})
+
     def _rotate_writer(self, width: int, height: int, now: datetime, now_mono: float) -> None:
         self._close_writer(now)
         self._prune_record_storage()
@@ -1010,6 +1051,12 @@ class RealCameraLoopService:
     def _close_writer_locked(self, closed_at: Optional[datetime] = None) -> None:
         closed_at = closed_at or datetime.now()
         video_path = self._writer_path
+        if self._writer_thread is not None and self._write_queue is not None:
+            # Drain queued frames before releasing the writer so the segment is complete.
+            self._write_queue.put(None)
+            self._writer_thread.join()
+        self._writer_thread = None
+        self._write_queue = None
         if self._writer is not None:
             self._writer.release()
             self._writer = None